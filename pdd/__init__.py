@@ -69,6 +69,11 @@ def get_version() -> str:
 # operations. The module should have a large context window and be affordable.
 EXTRACTION_STRENGTH = 0.5
 
+# Strength and thinking time for cheap yes/no checks such as detecting an
+# unfinished LLM generation. These never need the top-tier model.
+VERIFICATION_STRENGTH = 0.1
+VERIFICATION_TIME = 0.1
+
 DEFAULT_STRENGTH = float(os.getenv("PDD_STRENGTH_DEFAULT", "1.0"))
 
 DEFAULT_TEMPERATURE = 0.0
@@ -32,6 +32,8 @@ if '--quiet' in sys.argv or _is_structured_json_invocation(sys.argv):
 _DEFAULTS = {
     "__version__": "unknown",
     "EXTRACTION_STRENGTH": 0.5,
+    "VERIFICATION_STRENGTH": 0.1,
+    "VERIFICATION_TIME": 0.1,
     "DEFAULT_STRENGTH": 1.0,
     "DEFAULT_TEMPERATURE": 0.0,
     "DEFAULT_TIME": 0.25,
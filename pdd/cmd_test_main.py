@@ -3,18 +3,25 @@ Main entry point for the 'test' command.
 """
 from __future__ import annotations
 
+import gzip
+import io
 import json
+import mmap
 import os
 from pathlib import Path
+from typing import Literal
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from rich.panel import Panel
+from urllib3.util.retry import Retry
 
 from .config_resolution import resolve_effective_config
 from .construct_paths import construct_paths
 from .core.cloud import CloudConfig, get_cloud_timeout, get_cloud_request_timeout
+from .core.cloud_retry import CircuitBreaker, CircuitBreakerOpenError, retry
 from .generate_test import generate_test
 from .increase_tests import increase_tests
 from .test_result import TestResult
@@ -26,8 +33,222 @@ from .code_generator_main import (
     _verify_test_churn,
 )
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 console = Console()
 
+# Existing test files at least this large are memory-mapped instead of read.
+_MMAP_MIN_BYTES = 64 * 1024
+
+# Cloud request bodies larger than this are gzip-compressed.
+_GZIP_MIN_BYTES = 8192
+
+# Read size used to discard the unparsed tail of a streamed cloud response.
+_DRAIN_CHUNK_BYTES = 65536
+
+# Process-wide session so repeated cloud calls (library use, sync loops, tests)
+# reuse pooled TCP/TLS connections instead of handshaking on every request.
+# urllib3 only retries connect-level failures and idempotent requests; status
+# codes are left to ``retry`` below so the two layers do not multiply.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
+
+# Shared across calls so a cloud outage sends later requests straight to the
+# local fallback instead of through another round of retries.
+_CLOUD_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+
+
+def _info(message: str, style: str) -> None:
+    """Print a status line, skipping Rich rendering when stdout is not a terminal.
+
+    ``message`` is printed verbatim, so it must not contain Rich markup.
+    """
+    if console.is_terminal:
+        console.print(message, style=style, markup=False)
+    else:
+        print(message, flush=True)
+
+
+def _classify_test_file(path: str | Path) -> Literal["example", "code"]:
+    """Return "example" when ``path`` is a ``*_example`` file, else "code".
+
+    Example files get TDD-style test generation. The suffix check is
+    case-sensitive and ignores the file extension.
+    """
+    return "example" if Path(path).stem.endswith("_example") else "code"
+
+
+def _read_existing_tests(paths: list[str]) -> str | None:
+    """Read and newline-join existing test files, decoding the result once.
+
+    Files of at least ``_MMAP_MIN_BYTES`` are memory-mapped so their bytes
+    are copied only once, into the joined buffer; smaller files are read
+    directly since mmap setup is page-granular. Missing files are skipped and
+    unreadable ones produce a warning. Returns None when nothing was read.
+    """
+    names: list[str] = []
+    chunks: list = []
+    maps: list[mmap.mmap] = []
+    resolved: dict[str, str] = {}
+    try:
+        for et_path in paths:
+            try:
+                real_path = resolved.get(et_path)
+                if real_path is None:
+                    real_path = resolved[et_path] = os.path.realpath(os.path.expanduser(et_path))
+                try:
+                    size = os.stat(real_path).st_size
+                except FileNotFoundError:
+                    continue
+                if size >= _MMAP_MIN_BYTES:
+                    fd = os.open(real_path, os.O_RDONLY)
+                    try:
+                        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                    finally:
+                        os.close(fd)
+                    maps.append(mapped)
+                    chunks.append(mapped)
+                else:
+                    with open(real_path, "rb") as f:
+                        chunks.append(f.read())
+                names.append(et_path)
+            except Exception as e:
+                console.print(
+                    f"[yellow]Warning: Could not read existing test file {et_path}: {e}[/yellow]"
+                )
+
+        if not chunks:
+            return None
+        joined = b"\n".join(chunks)
+        # Match text-mode reads, which translate CRLF/CR line endings. CR never
+        # occurs inside a multi-byte UTF-8 sequence, so this is safe on bytes
+        # and avoids a second full-size str copy after decoding.
+        if b"\r" in joined:
+            joined = joined.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        try:
+            return joined.decode("utf-8")
+        except UnicodeDecodeError:
+            # Decode per file so one bad file is reported and skipped.
+            decoded = []
+            for name, chunk in zip(names, chunks):
+                try:
+                    decoded.append(bytes(chunk).decode("utf-8"))
+                except UnicodeDecodeError as e:
+                    console.print(
+                        f"[yellow]Warning: Could not read existing test file {name}: {e}[/yellow]"
+                    )
+            if not decoded:
+                return None
+            text = "\n".join(decoded)
+            return text.replace("\r\n", "\n").replace("\r", "\n")
+    finally:
+        for mapped in maps:
+            mapped.close()
+
+
+_CLOUD_RESPONSE_FIELDS = ("generatedTest", "totalCost", "modelName")
+
+
+def _encode_cloud_payload(payload: dict, compress: bool = False) -> tuple[dict, dict]:
+    """Return the ``requests`` body kwargs and extra headers for ``payload``.
+
+    The body is pre-encoded once (so retries reuse it) with ``orjson`` when
+    installed. With ``compress``, bodies over ``_GZIP_MIN_BYTES`` are
+    gzip-compressed and sent with ``Content-Encoding: gzip``. Otherwise,
+    without ``orjson``, the payload is passed as ``json=`` for the stdlib
+    encoder.
+    """
+    body = None
+    if orjson is not None:
+        try:
+            body = orjson.dumps(payload)
+        except TypeError:
+            pass
+    if compress:
+        if body is None:
+            body = json.dumps(payload).encode("utf-8")
+        if len(body) > _GZIP_MIN_BYTES:
+            return (
+                {"data": gzip.compress(body, compresslevel=6)},
+                {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+    if body is not None:
+        return {"data": body}, {"Content-Type": "application/json"}
+    return {"json": payload}, {}
+
+
+def _parse_cloud_response(response: requests.Response) -> dict:
+    """Extract the generateTest result fields from a streamed cloud response.
+
+    With ``ijson`` installed the top-level keys are parsed incrementally from
+    the raw socket stream, so the body is never held as bytes, str and dict at
+    once. Once all result fields have been seen the rest of the body is read
+    and discarded, and the response is closed.
+    Without it (or when the body is not a raw stream) this is
+    ``response.json()``. Malformed bodies raise ``json.JSONDecodeError``.
+    """
+    raw = getattr(response, "raw", None)
+    if ijson is None or not isinstance(raw, io.IOBase):
+        return response.json()
+
+    raw.decode_content = True  # let urllib3 undo any Content-Encoding
+    data: dict = {}
+    try:
+        for key, value in ijson.kvitems(raw, ""):
+            if key in _CLOUD_RESPONSE_FIELDS:
+                data[key] = value
+                if len(data) == len(_CLOUD_RESPONSE_FIELDS):
+                    break
+        # Read past the fields we need: urllib3 only returns the connection
+        # to the session pool once the body has been consumed.
+        while raw.read(_DRAIN_CHUNK_BYTES):
+            pass
+    except ijson.JSONError as e:
+        raise json.JSONDecodeError(str(e), "", 0) from e
+    finally:
+        response.close()
+    return data
+
+
+def _write_output(path: Path, *chunks: bytes, append: bool = False) -> None:
+    """Write ``chunks`` in order to ``path`` through a raw fd, bypassing the io buffer stack.
+
+    The file is truncated unless ``append`` is set, in which case every write
+    lands at the current end of file (``O_APPEND``). ``os.write`` may return
+    short counts for very large buffers, so it is retried until all bytes are
+    written. Missing parent directories are created only when the open fails,
+    so the usual write into an existing directory costs no extra syscalls.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    try:
+        fd = os.open(str(path), flags, 0o644)
+    except FileNotFoundError:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(path), flags, 0o644)
+    try:
+        for data in chunks:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+    finally:
+        os.close(fd)
+
 
 def cmd_test_main(
     ctx: click.Context,
@@ -78,6 +299,13 @@ def cmd_test_main(
         tuple: (generated_test_code, total_cost, model_name, agentic_success)
             agentic_success is True/False for non-Python agentic generation, None for Python.
     """
+    # Global CLI options, read once. Cloud vs local is fixed by the CLI
+    # flags, so it is known before any I/O.
+    obj = ctx.obj or {}
+    is_local = obj.get("local", False)
+    verbose = obj.get("verbose", False)
+    quiet = obj.get("quiet", False)
+
     # 1. Prepare inputs for path construction
     input_file_paths = {
         "prompt_file": prompt_file,
@@ -111,11 +339,11 @@ def cmd_test_main(
         resolved_config, input_strings, output_file_paths, detected_language = construct_paths(
             input_file_paths=input_file_paths,
             command_options=command_options,
-            force=ctx.obj.get("force", False),
-            quiet=ctx.obj.get("quiet", False),
+            force=obj.get("force", False),
+            quiet=quiet,
             command="test",
-            context_override=ctx.obj.get("context"),
-            confirm_callback=ctx.obj.get("confirm_callback"),
+            context_override=obj.get("context"),
+            confirm_callback=obj.get("confirm_callback"),
         )
     except Exception as e:
         console.print(f"[bold red]Error constructing paths: {e}[/bold red]")
@@ -132,15 +360,13 @@ def cmd_test_main(
     eff_strength = eff_config["strength"]
     eff_temperature = eff_config["temperature"]
     eff_time = eff_config["time"]
-    verbose = ctx.obj.get("verbose", False)
-    is_local = ctx.obj.get("local", False)
 
     # 3.5 Agentic test generation: Use for non-Python OR when agentic_mode is enabled
     # For non-Python languages, the single LLM call often produces incorrect test file
     # extensions or doesn't follow the correct framework. Agentic mode lets the agent
     # explore the project and determine the correct test setup.
     # For Python with agentic_mode=True, we also use agentic test generation for consistency.
-    agentic_mode = ctx.obj.get("agentic_mode", False)
+    agentic_mode = obj.get("agentic_mode", False)
     # For Python test_extend (merge=True), use native path which properly
     # merges with existing tests. The agentic path ignores existing_tests
     # and merge, overwriting the file entirely — destroying coverage.
@@ -173,7 +399,7 @@ def cmd_test_main(
             code_file=Path(code_file),
             output_test_file=output_test_path,
             verbose=verbose,
-            quiet=ctx.obj.get("quiet", False),
+            quiet=quiet,
             # Forward the explicit repair directive (#1012, F-H) so the
             # agentic path uses the caller-provided value instead of
             # reading `PDD_REPAIR_DIRECTIVE` from the env. Direct CLI
@@ -211,8 +437,8 @@ def cmd_test_main(
             output_test_path.parent.mkdir(parents=True, exist_ok=True)
             output_test_path.write_text(generated_content, encoding="utf-8")
 
-            if not ctx.obj.get("quiet", False):
-                console.print(f"[green]Agentic test generation completed.[/green]")
+            if not quiet:
+                _info("Agentic test generation completed.", style="green")
         else:
             # Empty/missing generated_content with a pre-existing canonical
             # test file is the deletion variant of test churn ONLY when the
@@ -277,12 +503,12 @@ def cmd_test_main(
                 # were a churn issue.
                 output_test_path.parent.mkdir(parents=True, exist_ok=True)
                 output_test_path.write_text(existing_test_content, encoding="utf-8")
-                if not ctx.obj.get("quiet", False):
+                if not quiet:
                     console.print(
                         "[yellow]Agentic test generation failed; "
                         "pre-existing test file restored.[/yellow]"
                     )
-            elif not ctx.obj.get("quiet", False):
+            elif not quiet:
                 # First-time generation (no pre-existing canonical test file)
                 # is the documented exemption: keep the warning-and-return
                 # behavior. Also covers the (agentic_success=False, no
@@ -330,25 +556,12 @@ def cmd_test_main(
     # Handle existing tests concatenation
     concatenated_tests = None
     if existing_tests:
-        test_contents = []
-        for et_path in existing_tests:
-            try:
-                # We read these manually because construct_paths only reads
-                # what's in input_file_paths keys. While we added
-                # existing_test_0, we might have multiple. To be safe and
-                # consistent with the requirement "read all files", we read
-                # them here. Note: construct_paths might have read
-                # 'existing_test_0', but we need all of them.
-                p = Path(et_path).expanduser().resolve()
-                if p.exists():
-                    test_contents.append(p.read_text(encoding="utf-8"))
-            except Exception as e:
-                console.print(
-                    f"[yellow]Warning: Could not read existing test file {et_path}: {e}[/yellow]"
-                )
-
-        if test_contents:
-            concatenated_tests = "\n".join(test_contents)
+        # We read these manually because construct_paths only reads what's in
+        # input_file_paths keys. While we added existing_test_0, we might have
+        # multiple. To be safe and consistent with the requirement "read all
+        # files", we read them here.
+        concatenated_tests = _read_existing_tests(existing_tests)
+        if concatenated_tests is not None:
             # Update input_strings for consistency if needed downstream
             input_strings["existing_tests"] = concatenated_tests
 
@@ -356,17 +569,16 @@ def cmd_test_main(
     mode = "increase" if coverage_report else "generate"
 
     # Prepare metadata for generation
-    source_file_path = str(Path(code_file).expanduser().resolve())
+    source_file_path = os.path.realpath(os.path.expanduser(code_file))
     # output_file_paths['output_file'] is set by construct_paths based on
     # --output or defaults
-    test_file_path = str(
-        Path(output_file_paths.get("output_file", "test_output.py"))
-        .expanduser().resolve()
+    test_file_path = os.path.realpath(
+        os.path.expanduser(output_file_paths.get("output_file", "test_output.py"))
     )
     module_name = Path(source_file_path).stem
 
     # Determine if code file is an example (for TDD style generation)
-    is_example = Path(code_file).stem.endswith("_example")
+    is_example = _classify_test_file(code_file) == "example"
 
     # Check for cloud-only mode
     cloud_only = os.environ.get("PDD_CLOUD_ONLY", "").lower() in ("1", "true", "yes")
@@ -388,12 +600,6 @@ def cmd_test_main(
                     )
                 )
 
-            # Get JWT Token using CloudConfig
-            jwt_token = CloudConfig.get_jwt_token(verbose=verbose)
-
-            if not jwt_token:
-                raise Exception("Failed to obtain JWT token.")
-
             # Prepare Payload
             payload = {
                 "promptContent": prompt_content,
@@ -424,28 +630,68 @@ def cmd_test_main(
                 payload["existingTests"] = concatenated_tests
                 payload["coverageReport"] = input_strings.get("coverage_report", "")
 
+            # Get JWT Token using CloudConfig (only once the request is ready to send)
+            jwt_token = CloudConfig.get_jwt_token(verbose=verbose)
+
+            if not jwt_token:
+                raise Exception("Failed to obtain JWT token.")
+
             # Make Request
             cloud_url = CloudConfig.get_endpoint_url("generateTest")
             headers = {"Authorization": f"Bearer {jwt_token}"}
-            response = requests.post(
-                cloud_url,
-                json=payload,
-                headers=headers,
-                timeout=get_cloud_request_timeout()
+            body_kwargs, body_headers = _encode_cloud_payload(
+                payload, compress=CloudConfig.SUPPORTS_GZIP
             )
+            if verbose and "data" in body_kwargs:
+                console.print(f"Cloud request body: {len(body_kwargs['data'])} bytes")
+
+            @retry(max_attempts=3, base=0.25, cap=2.0)
+            def _post():
+                nonlocal body_kwargs, body_headers
+                resp = _SESSION.post(
+                    cloud_url,
+                    **body_kwargs,
+                    headers={**headers, **body_headers},
+                    timeout=get_cloud_request_timeout(),
+                    stream=True,
+                )
+                if resp.status_code == 415 and "Content-Encoding" in body_headers:
+                    # Server does not accept compressed bodies: stop sending
+                    # them for the rest of the process and resend uncompressed.
+                    CloudConfig.SUPPORTS_GZIP = False
+                    resp.close()
+                    body_kwargs, body_headers = _encode_cloud_payload(payload)
+                    resp = _SESSION.post(
+                        cloud_url,
+                        **body_kwargs,
+                        headers={**headers, **body_headers},
+                        timeout=get_cloud_request_timeout(),
+                        stream=True,
+                    )
+                # Check for HTTP errors explicitly (5xx is retried above)
+                try:
+                    resp.raise_for_status()
+                except requests.exceptions.HTTPError:
+                    # Buffer the error body for the handlers below, then hand
+                    # the streamed connection back before retrying or raising.
+                    _ = resp.content
+                    resp.close()
+                    raise
+                return resp
 
-            # Check for HTTP errors explicitly
-            response.raise_for_status()
+            response = _CLOUD_BREAKER.execute(_post)
 
             # Parse response
             try:
-                data = response.json()
+                data = _parse_cloud_response(response)
             except json.JSONDecodeError as json_err:
                 if cloud_only:
                     raise click.UsageError(f"Cloud returned invalid JSON: {json_err}")
                 console.print("[yellow]Cloud returned invalid JSON, falling back to local.[/yellow]")
                 is_local = True
                 raise  # Re-raise to exit try block
+            finally:
+                response.close()
 
             generated_content = data.get("generatedTest", "")
             total_cost = float(data.get("totalCost", 0.0))
@@ -459,7 +705,7 @@ def cmd_test_main(
                 is_local = True
             else:
                 # Success!
-                console.print("[green]Cloud Success[/green]")
+                _info("Cloud Success", style="green")
 
         except click.UsageError:
             # Re-raise UsageError without wrapping
@@ -502,6 +748,11 @@ def cmd_test_main(
         except json.JSONDecodeError:
             # Already handled above, just ensure we fall through to local
             pass
+        except CircuitBreakerOpenError as breaker_err:
+            if cloud_only:
+                raise click.UsageError(f"Cloud execution unavailable: {breaker_err}")
+            console.print("[yellow]Cloud unavailable after repeated failures, falling back to local.[/yellow]")
+            is_local = True
         except Exception as e:
             if cloud_only:
                 raise click.UsageError(f"Cloud execution failed: {e}")
@@ -565,38 +816,32 @@ def cmd_test_main(
     try:
         final_output_path = Path(output_file_paths["output"])
 
-        # Ensure parent directory exists
-        final_output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        write_mode = "w"
-        content_to_write = generated_content
-
         # Handle merge logic
-        if merge and existing_tests:
-            # If merging, we write to the first existing test file
+        append = bool(merge and existing_tests)
+        if append:
+            # If merging, we append to the first existing test file
             final_output_path = Path(existing_tests[0])
-            write_mode = "a"
-            content_to_write = "\n\n" + generated_content
             if verbose:
                 console.print(f"Merging new tests into existing file: {final_output_path}")
-
-        if write_mode == "w":
+        else:
             existing_test_content = ""
             if final_output_path.exists() and final_output_path.is_file():
                 existing_test_content = final_output_path.read_text(encoding="utf-8")
             _verify_test_churn(
                 existing_code=existing_test_content,
-                generated_code=content_to_write,
+                generated_code=generated_content,
                 prompt_name=Path(prompt_file).name,
                 output_path=str(final_output_path),
                 prompt_content=input_strings.get("prompt_file", ""),
             )
 
-        with open(str(final_output_path), write_mode, encoding="utf-8") as f:
-            f.write(content_to_write)
+        # Appended tests are separated from the existing ones by a blank line;
+        # the separator is written separately rather than copying the content.
+        chunks = (b"\n\n",) if append else ()
+        _write_output(final_output_path, *chunks, generated_content.encode("utf-8"), append=append)
 
-        if not ctx.obj.get("quiet", False):
-            console.print(f"[green]Successfully wrote tests to {final_output_path}[/green]")
+        if not quiet:
+            _info(f"Successfully wrote tests to {final_output_path}", style="green")
 
     except TestChurnError as e:
         e.total_cost = float(total_cost or 0.0)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
 import re
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
@@ -9,6 +11,7 @@ import click
 from rich.console import Console
 
 from ..core.errors import handle_error
+from ..core.file_cache import read_text_cached
 from ..operation_log import log_operation
 from ..track_cost import track_cost
 
@@ -18,6 +21,9 @@ _GITHUB_ISSUE_RE = re.compile(
 )
 _USER_STORY_RE = re.compile(r"^story__.+\.md$", re.IGNORECASE)
 
+PDD_FIX_CONCURRENCY_ENV = "PDD_FIX_CONCURRENCY"
+DEFAULT_FIX_CONCURRENCY = 4
+
 
 def _is_issue_url(value: str) -> bool:
     """Return True when the first CLI argument is a GitHub issue URL."""
@@ -30,6 +36,31 @@ def _is_user_story_file(value: str) -> bool:
     return bool(_USER_STORY_RE.match(Path(value).name))
 
 
+def _fix_concurrency() -> int:
+    """Return the max number of unit test files fixed in parallel (at least 1)."""
+    try:
+        return max(1, int(os.environ.get(PDD_FIX_CONCURRENCY_ENV, str(DEFAULT_FIX_CONCURRENCY))))
+    except ValueError:
+        return DEFAULT_FIX_CONCURRENCY
+
+
+def _is_per_file_output(path: Optional[str]) -> bool:
+    """Return True when an output option resolves to a distinct file per unit test.
+
+    Unset options and directories get a name derived from each test file;
+    an explicit file path is shared by every test file.
+    """
+    return not path or Path(path).is_dir()
+
+
+def _read_optional(path: str) -> Optional[str]:
+    """Return cached file text, or None so fix_main reports a missing file itself."""
+    try:
+        return read_text_cached(path)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
 @click.command(name="fix")
 @click.argument("args", nargs=-1)
 @click.option("--manual", is_flag=True, help="Use manual mode with explicit file arguments.")
@@ -74,6 +105,15 @@ def _is_user_story_file(value: str) -> bool:
 @click.option("--output-code", type=click.Path(), help="Specify where to save the fixed code file.")
 @click.option("--output-results", type=click.Path(), help="Specify where to save the results log.")
 @click.option("--loop", is_flag=True, help="Enable iterative fixing process.")
+@click.option(
+    "--batch",
+    is_flag=True,
+    help=(
+        "Fix multiple unit test files with one LLM request per batch instead of one per file "
+        "(requires --local; not with --loop or --auto-submit; --output-test must be omitted "
+        "or a directory)."
+    ),
+)
 @click.option(
     "--verification-program",
     type=click.Path(),
@@ -123,6 +163,7 @@ def fix(
     output_code: Optional[str],
     output_results: Optional[str],
     loop: bool,
+    batch: bool,
     verification_program: Optional[str],
     max_attempts: int,
     budget: float,
@@ -234,6 +275,20 @@ def fix(
         if not unit_test_files:
             raise click.UsageError("At least one unit test file must be provided.")
 
+        # Batched fixing is a local single-pass path: it has no cloud attempt,
+        # agentic fallback (loop only) or example auto-submit.
+        if batch:
+            if loop:
+                raise click.UsageError("--batch cannot be combined with --loop.")
+            if auto_submit:
+                raise click.UsageError("--batch cannot be combined with --auto-submit.")
+            if not ctx.obj.get("local", False):
+                raise click.UsageError("--batch runs locally only; pass the global --local option.")
+            if len(unit_test_files) > 1 and output_test and not Path(output_test).is_dir():
+                raise click.UsageError(
+                    "--batch writes one fixed file per test file; --output-test must be a directory."
+                )
+
         total_cost = 0.0
         total_attempts = 0
         last_model = ""
@@ -241,43 +296,132 @@ def fix(
         fixed_unit_tests = []
         summary_lines = []
 
-        for index, unit_test_file in enumerate(unit_test_files, start=1):
-            if not quiet and len(unit_test_files) > 1:
-                console.print(
-                    "[bold blue]"
-                    f"Processing test file {index}/{len(unit_test_files)}: {unit_test_file}"
-                    "[/bold blue]"
-                )
+        if batch and len(unit_test_files) > 1:
+            from ..fix_main import fix_main_batch
 
-            success, _fixed_unit_test, _fixed_code, attempts, cost, model = fix_main(
+            batch_results, _fixed_code, total_attempts, total_cost, last_model = fix_main_batch(
                 ctx=ctx,
                 prompt_file=prompt_file,
                 code_file=code_file,
-                unit_test_file=unit_test_file,
+                unit_test_files=list(unit_test_files),
                 error_file=error_file,
                 output_test=output_test,
                 output_code=output_code,
                 output_results=output_results,
-                loop=loop,
-                verification_program=verification_program,
-                max_attempts=max_attempts,
                 budget=budget,
-                auto_submit=auto_submit,
-                agentic_fallback=agentic_fallback,
                 strength=None,
                 temperature=None,
                 protect_tests=protect_tests,
-                failure_aware_retries=failure_aware_retries,
             )
+            for unit_test_file in unit_test_files:
+                if unit_test_file not in batch_results:
+                    all_success = False
+                    summary_lines.append(f"{unit_test_file}: Skipped (budget exhausted)")
+                    continue
+                success, output_test_path = batch_results[unit_test_file]
+                all_success = all_success and success
+                summary_lines.append(f"{unit_test_file}: {'Fixed' if success else 'Failed'}")
+                if success:
+                    fixed_unit_tests.append(output_test_path)
+        else:
+            # Test files are fixed concurrently only when nothing is shared
+            # between them: --loop iterates on shared state, an explicit
+            # output file (including --output-code over the input) is written
+            # by every test file, and without the global --force
+            # construct_paths may prompt for overwrites on one stdin. Serial
+            # runs re-read the code file so each sees the previous fix.
+            serial = (
+                loop
+                or not ctx.obj.get("force", False)
+                or not all(
+                    _is_per_file_output(path) for path in (output_test, output_code, output_results)
+                )
+            )
+            workers = 1 if serial else min(len(unit_test_files), _fix_concurrency())
+
+            # Shared inputs are read once, through the mtime-keyed cache.
+            prompt_content = _read_optional(prompt_file)
+            code_content = None if serial else _read_optional(code_file)
+
+            def _fix_one(index: int, unit_test_file: str, file_budget: float):
+                if not quiet and len(unit_test_files) > 1:
+                    console.print(
+                        "[bold blue]"
+                        f"Processing test file {index}/{len(unit_test_files)}: {unit_test_file}"
+                        "[/bold blue]"
+                    )
+                return fix_main(
+                    ctx=ctx,
+                    prompt_file=prompt_file,
+                    code_file=code_file,
+                    unit_test_file=unit_test_file,
+                    error_file=error_file,
+                    output_test=output_test,
+                    output_code=output_code,
+                    output_results=output_results,
+                    loop=loop,
+                    verification_program=verification_program,
+                    max_attempts=max_attempts,
+                    budget=file_budget,
+                    auto_submit=auto_submit,
+                    agentic_fallback=agentic_fallback,
+                    strength=None,
+                    temperature=None,
+                    protect_tests=protect_tests,
+                    failure_aware_retries=failure_aware_retries,
+                    prompt_content=prompt_content,
+                    code_content=_read_optional(code_file) if serial else code_content,
+                )
 
-            total_cost += cost
-            total_attempts += attempts
-            last_model = model
-            all_success = all_success and success
-            summary_lines.append(f"{unit_test_file}: {'Fixed' if success else 'Failed'}")
-
-            if success:
-                fixed_unit_tests.append(output_test or unit_test_file)
+            # Per-file outcome by 1-based index; totals are accumulated as each
+            # file finishes so the summary below is a single ordered pass.
+            results: Dict[int, Tuple[bool, str]] = {}
+
+            def _record(index: int, result: Tuple[Any, ...]) -> None:
+                nonlocal total_cost, total_attempts, all_success
+                success, _fixed_unit_test, _fixed_code, attempts, cost, model = result
+                results[index] = (success, model)
+                total_cost += cost
+                total_attempts += attempts
+                all_success = all_success and success
+
+            if workers <= 1:
+                for index, unit_test_file in enumerate(unit_test_files, start=1):
+                    _record(index, _fix_one(index, unit_test_file, budget))
+            else:
+                # At most ``workers`` files are in flight. Each new file gets
+                # an equal share of the budget not yet spent or handed to a
+                # running file, so in-flight files together stay within it.
+                queued = iter(enumerate(unit_test_files, start=1))
+                pending: Dict[Any, Tuple[int, float]] = {}
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    while True:
+                        free_slots = workers - len(pending)
+                        reserved = sum(share for _, share in pending.values())
+                        available = budget - total_cost - reserved
+                        if free_slots and available > 0:
+                            item = next(queued, None)
+                            if item is not None:
+                                index, unit_test_file = item
+                                share = available / free_slots
+                                future = executor.submit(_fix_one, index, unit_test_file, share)
+                                pending[future] = (index, share)
+                                continue
+                        if not pending:
+                            break
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            _record(pending.pop(future)[0], future.result())
+
+            for index, unit_test_file in enumerate(unit_test_files, start=1):
+                if index not in results:
+                    all_success = False
+                    summary_lines.append(f"{unit_test_file}: Skipped (budget exhausted)")
+                    continue
+                success, last_model = results[index]
+                summary_lines.append(f"{unit_test_file}: {'Fixed' if success else 'Failed'}")
+                if success:
+                    fixed_unit_tests.append(output_test or unit_test_file)
 
         summary = "\n".join(summary_lines)
         if all_success:
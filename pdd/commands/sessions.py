@@ -14,6 +14,42 @@ from ..remote_session import RemoteSessionManager, RemoteSessionError
 console = Console()
 
 
+def _render_status(status: str) -> str:
+    """Wrap a session status in rich color markup."""
+    if status.lower() == "active":
+        return f"[green]{status}[/green]"
+    if status.lower() == "stale":
+        return f"[yellow]{status}[/yellow]"
+    return status
+
+
+def _print_plain_table(headers: List[str], rows: List[List[str]]) -> None:
+    """Print rows as a column-aligned plain-text table.
+
+    Used instead of a rich Table when output is not a terminal (pipes, CI,
+    tests), where styling is lost anyway and rich rendering is comparatively
+    expensive.
+    """
+    widths = [
+        max([len(header)] + [len(row[i]) for row in rows])
+        for i, header in enumerate(headers)
+    ]
+    for line in [headers, *rows]:
+        click.echo("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip())
+
+
+def _require_jwt_token() -> Optional[str]:
+    """Return the cloud JWT, or print the login hint and return None.
+
+    Called from the synchronous Click commands, before ``asyncio.run``: the
+    device flow cannot start from inside a running event loop.
+    """
+    jwt_token = CloudConfig.get_jwt_token()
+    if not jwt_token:
+        console.print("[red]Error: Not authenticated. Please run 'pdd auth login'.[/red]")
+    return jwt_token
+
+
 @click.group(name="sessions")
 def sessions() -> None:
     """Manage remote PDD sessions."""
@@ -28,13 +64,23 @@ def list_sessions(json_output: bool) -> None:
     Retrieves a list of active remote sessions associated with the current
     authenticated user and displays them in a table or as JSON.
     """
-    jwt_token = CloudConfig.get_jwt_token()
+    jwt_token = _require_jwt_token()
     if not jwt_token:
-        console.print("[red]Error: Not authenticated. Please run 'pdd auth login'.[/red]")
         return
+    output_data = asyncio.run(_list_sessions_impl(jwt_token, json_output))
+    if output_data is not None:
+        console.print_json(data=output_data)
 
+
+async def _list_sessions_impl(jwt_token: str, json_output: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """Implementation of ``pdd sessions list``.
+
+    With ``json_output`` the sessions are returned as a list of dicts for the
+    caller to serialize; otherwise they are rendered as a table and None is
+    returned.
+    """
     try:
-        sessions_list = asyncio.run(RemoteSessionManager.list_sessions(jwt_token))
+        sessions_list = await RemoteSessionManager.list_sessions(jwt_token)
     except Exception as e:
         console.print(f"[red]Error listing sessions: {e}[/red]")
         return
@@ -49,20 +95,14 @@ def list_sessions(json_output: bool) -> None:
                 output_data.append(s.dict())
             else:
                 output_data.append(s.__dict__)
-        console.print_json(data=output_data)
-        return
+        return output_data
 
     if not sessions_list:
         console.print("[yellow]No active remote sessions found.[/yellow]")
         return
 
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("SESSION ID", style="dim", width=12)
-    table.add_column("PROJECT")
-    table.add_column("CLOUD URL", style="blue")
-    table.add_column("STATUS")
-    table.add_column("LAST SEEN")
-
+    headers = ["SESSION ID", "PROJECT", "CLOUD URL", "STATUS", "LAST SEEN"]
+    rows = []
     for session in sessions_list:
         # Safely access attributes with defaults
         s_id = getattr(session, "session_id", "unknown")
@@ -74,22 +114,21 @@ def list_sessions(json_output: bool) -> None:
         # Truncate ID for display
         display_id = s_id[:8] if len(s_id) > 8 else s_id
 
-        # Colorize status
-        status_str = str(status)
-        if status_str.lower() == "active":
-            status_render = f"[green]{status_str}[/green]"
-        elif status_str.lower() == "stale":
-            status_render = f"[yellow]{status_str}[/yellow]"
-        else:
-            status_render = status_str
+        rows.append([display_id, str(project), str(url), str(status), str(last_seen)])
+
+    if not console.is_terminal:
+        _print_plain_table(headers, rows)
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("SESSION ID", style="dim", width=12)
+    table.add_column("PROJECT")
+    table.add_column("CLOUD URL", style="blue")
+    table.add_column("STATUS")
+    table.add_column("LAST SEEN")
 
-        table.add_row(
-            display_id,
-            str(project),
-            str(url),
-            status_render,
-            str(last_seen)
-        )
+    for display_id, project, url, status, last_seen in rows:
+        table.add_row(display_id, project, url, _render_status(status), last_seen)
 
     console.print(table)
 
@@ -102,15 +141,18 @@ def session_info(session_id: str) -> None:
     Args:
         session_id: The unique identifier of the session to inspect.
     """
-    jwt_token = CloudConfig.get_jwt_token()
+    jwt_token = _require_jwt_token()
     if not jwt_token:
-        console.print("[red]Error: Not authenticated. Please run 'pdd auth login'.[/red]")
         return
+    asyncio.run(_session_info_impl(jwt_token, session_id))
 
+
+async def _session_info_impl(jwt_token: str, session_id: str) -> None:
+    """Implementation of ``pdd sessions info``."""
     try:
         # Attempt to fetch specific session details
         # Note: Assuming get_session exists on RemoteSessionManager
-        session = asyncio.run(RemoteSessionManager.get_session(jwt_token, session_id))
+        session = await RemoteSessionManager.get_session(jwt_token, session_id)
     except Exception as e:
         console.print(f"[red]Error fetching session: {e}[/red]")
         return
@@ -154,13 +196,18 @@ def cleanup_sessions(cleanup_all: bool, cleanup_stale: bool, force: bool) -> Non
     By default, lists sessions and prompts for cleanup.
     Use --all to cleanup all sessions, or --stale to cleanup only stale sessions.
     """
-    jwt_token = CloudConfig.get_jwt_token()
+    jwt_token = _require_jwt_token()
     if not jwt_token:
-        console.print("[red]Error: Not authenticated. Please run 'pdd auth login'.[/red]")
         return
+    asyncio.run(_cleanup_sessions_impl(jwt_token, cleanup_all, cleanup_stale, force))
 
+
+async def _cleanup_sessions_impl(
+    jwt_token: str, cleanup_all: bool, cleanup_stale: bool, force: bool
+) -> None:
+    """Implementation of ``pdd sessions cleanup``."""
     try:
-        sessions_list = asyncio.run(RemoteSessionManager.list_sessions(jwt_token))
+        sessions_list = await RemoteSessionManager.list_sessions(jwt_token)
     except Exception as e:
         console.print(f"[red]Error listing sessions: {e}[/red]")
         return
@@ -180,13 +227,8 @@ def cleanup_sessions(cleanup_all: bool, cleanup_stale: bool, force: bool) -> Non
     else:
         # Interactive mode - show sessions and ask which to cleanup
         console.print("[bold]Current remote sessions:[/bold]")
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("#", style="dim", width=3)
-        table.add_column("SESSION ID", style="dim", width=12)
-        table.add_column("PROJECT")
-        table.add_column("STATUS")
-        table.add_column("LAST SEEN")
-
+        headers = ["#", "SESSION ID", "PROJECT", "STATUS", "LAST SEEN"]
+        rows = []
         for idx, session in enumerate(sessions_list, 1):
             s_id = getattr(session, "session_id", "unknown")
             project = getattr(session, "project_name", "default")
@@ -195,23 +237,23 @@ def cleanup_sessions(cleanup_all: bool, cleanup_stale: bool, force: bool) -> Non
 
             display_id = s_id[:8] if len(s_id) > 8 else s_id
 
-            status_str = str(status)
-            if status_str.lower() == "active":
-                status_render = f"[green]{status_str}[/green]"
-            elif status_str.lower() == "stale":
-                status_render = f"[yellow]{status_str}[/yellow]"
-            else:
-                status_render = status_str
+            rows.append([str(idx), display_id, str(project), str(status), str(last_seen)])
 
-            table.add_row(
-                str(idx),
-                display_id,
-                str(project),
-                status_render,
-                str(last_seen)
-            )
+        if console.is_terminal:
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("#", style="dim", width=3)
+            table.add_column("SESSION ID", style="dim", width=12)
+            table.add_column("PROJECT")
+            table.add_column("STATUS")
+            table.add_column("LAST SEEN")
+
+            for idx_str, display_id, project, status, last_seen in rows:
+                table.add_row(idx_str, display_id, project, _render_status(status), last_seen)
+
+            console.print(table)
+        else:
+            _print_plain_table(headers, rows)
 
-        console.print(table)
         console.print("\n[bold]Options:[/bold]")
         console.print("  - Enter session numbers (comma-separated) to cleanup specific sessions")
         console.print("  - Enter 'stale' to cleanup all stale sessions")
@@ -269,7 +311,7 @@ def cleanup_sessions(cleanup_all: bool, cleanup_stale: bool, force: bool) -> Non
     with console.status("[bold green]Cleaning up sessions..."):
         for session in sessions_to_cleanup:
             s_id = getattr(session, "session_id", "unknown")
-            if asyncio.run(cleanup_session(s_id)):
+            if await cleanup_session(s_id):
                 success_count += 1
             else:
                 fail_count += 1
@@ -15,6 +15,7 @@ import yaml
 from rich.console import Console
 from rich.theme import Theme
 
+from .core.file_cache import read_text_cached
 from .get_extension import get_extension
 from .get_language import get_language
 from .generate_output_paths import EXAMPLES_DIR, generate_output_paths
@@ -682,7 +683,7 @@ def get_tests_dir_from_config(start_path: Optional[Path] = None) -> Optional[Pat
 def _read_file(path: Path) -> str:
     """Read a text file safely and return its contents."""
     try:
-        return path.read_text(encoding="utf-8")
+        return read_text_cached(path)
     except Exception as exc:  # pragma: no cover
         # Error is raised in the main function after this fails
         console.print(f"[error]Could not read {path}: {exc}", style="error")
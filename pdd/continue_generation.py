@@ -7,7 +7,7 @@ from .load_prompt_template import load_prompt_template
 from .preprocess import preprocess
 from .llm_invoke import llm_invoke
 from .unfinished_prompt import unfinished_prompt
-from .generation_completion import completion_check_tail
+from .generation_completion import completion_check_tail, provider_finished_structurally
 from . import EXTRACTION_STRENGTH, DEFAULT_TIME
 
 console = Console()
@@ -137,15 +137,24 @@ def continue_generation(
             # Build prospective new block and check completeness on the updated tail
             new_code_block = code_block + continue_result
             last_chunk = completion_check_tail(new_code_block)
-            reasoning, is_finished, check_cost, check_model = unfinished_prompt(
-                prompt_text=last_chunk,
-                strength=0.5,
-                temperature=0,
-                time=time,
-                language=language,
-                verbose=verbose
-            )
-            total_cost += check_cost
+            if provider_finished_structurally(
+                new_code_block, continue_response.get('finish_reason'), language
+            ):
+                # The provider stopped normally and the combined output is
+                # structurally complete; no need for the LLM completion judge.
+                reasoning = "Provider reported completion and output passed structural checks."
+                is_finished = True
+                check_model = "structural_check"
+            else:
+                reasoning, is_finished, check_cost, check_model = unfinished_prompt(
+                    prompt_text=last_chunk,
+                    strength=0.5,
+                    temperature=0,
+                    time=time,
+                    language=language,
+                    verbose=verbose
+                )
+                total_cost += check_cost
 
             if verbose:
                 console.print(f"[magenta]Tail length:[/magenta] {len(last_chunk)}")
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 import asyncio
 import os
-from typing import Optional
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from rich.console import Console
 
@@ -20,8 +22,11 @@ from ..get_jwt_token import (
     TokenError,
     UserCancelledError,
     get_jwt_token as device_flow_get_token,
+    _decode_jwt_payload,
     _get_cached_jwt,
+    _get_expected_jwt_audience,
 )
+from .. import get_jwt_token as _jwt_auth
 
 console = Console()
 
@@ -71,6 +76,41 @@ def get_cloud_request_timeout() -> tuple[int, int]:
     return (CLOUD_CONNECT_TIMEOUT, get_cloud_timeout())
 
 
+# In-process JWT cache so repeated cloud calls in one process (fix then test,
+# sync loops, the server) skip re-reading/refreshing credentials. Entries are
+# tied to the expected audience and the on-disk cache file, so switching
+# environments or logging out invalidates them.
+JWT_MEMO_MARGIN_SECONDS = 30
+_JWT_MEMO: Dict[str, Any] = {"token": None, "exp": 0.0, "aud": None, "stamp": None}
+_JWT_MEMO_LOCK = threading.Lock()
+
+
+def _jwt_cache_file_stamp() -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of the on-disk JWT cache, or None if absent."""
+    try:
+        st = _jwt_auth.JWT_CACHE_FILE.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _remember_jwt(token: str, audience: Optional[str]) -> None:
+    """Memoize ``token`` until its ``exp`` claim; tokens without one are not kept."""
+    try:
+        exp = float(_decode_jwt_payload(token).get("exp", 0))
+    except (TypeError, ValueError):
+        exp = 0.0
+    if exp <= time.time() + JWT_MEMO_MARGIN_SECONDS:
+        return
+    _JWT_MEMO.update(token=token, exp=exp, aud=audience, stamp=_jwt_cache_file_stamp())
+
+
+def clear_jwt_memo() -> None:
+    """Forget the in-process JWT (e.g. after logout or in tests)."""
+    with _JWT_MEMO_LOCK:
+        _JWT_MEMO.update(token=None, exp=0.0, aud=None, stamp=None)
+
+
 # Default cloud endpoints
 DEFAULT_BASE_URL = "https://us-central1-prompt-driven-development.cloudfunctions.net"
 
@@ -104,6 +144,10 @@ CLOUD_ENDPOINTS = {
 class CloudConfig:
     """Centralized cloud configuration for all PDD commands."""
 
+    # Whether cloud endpoints accept gzip-compressed request bodies. Cleared
+    # for the rest of the process if an endpoint answers 415.
+    SUPPORTS_GZIP: bool = True
+
     @staticmethod
     def ensure_default_env() -> None:
         """Default PDD_ENV for CLI usage when unset."""
@@ -200,6 +244,28 @@ class CloudConfig:
                 console.print(f"[info]Using injected JWT token from {PDD_JWT_TOKEN_ENV}[/info]")
             return injected_token
 
+        # The lock also serializes concurrent callers (e.g. parallel fix
+        # workers) so only one of them can start a device flow.
+        expected_aud = _get_expected_jwt_audience()
+        with _JWT_MEMO_LOCK:
+            if (
+                _JWT_MEMO["token"]
+                and _JWT_MEMO["aud"] == expected_aud
+                and _JWT_MEMO["stamp"] == _jwt_cache_file_stamp()
+                and time.time() < _JWT_MEMO["exp"] - JWT_MEMO_MARGIN_SECONDS
+            ):
+                if verbose:
+                    console.print("[info]Using in-process JWT token[/info]")
+                return _JWT_MEMO["token"]
+
+            token = CloudConfig._fetch_jwt_token(verbose=verbose, app_name=app_name)
+            if token:
+                _remember_jwt(token, expected_aud)
+            return token
+
+    @staticmethod
+    def _fetch_jwt_token(verbose: bool, app_name: str) -> Optional[str]:
+        """Read the cached JWT from disk, or run the device flow to obtain one."""
         # Check file cache first (synchronous - works in async contexts)
         # This is critical for FastAPI endpoints which run in an event loop
         cached_jwt = _get_cached_jwt(verbose=verbose)
@@ -309,4 +375,5 @@ __all__ = [
     'get_cloud_timeout',
     'get_cloud_request_timeout',
     'CLOUD_CONNECT_TIMEOUT',
+    'clear_jwt_memo',
 ]
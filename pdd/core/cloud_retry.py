@@ -0,0 +1,159 @@
+"""
+Retry and circuit-breaker helpers for cloud requests.
+
+``retry`` re-issues a call on transient failures (timeouts, dropped
+connections, 502/503/504) with capped exponential backoff and full jitter.
+``CircuitBreaker`` tracks consecutive transient failures across calls so that,
+once the cloud is clearly unavailable, callers fall back to local execution
+immediately instead of waiting out another round of retries.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
+import threading
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class CircuitBreakerOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for errors worth retrying: timeouts, connection drops, 502/503/504.
+
+    Client errors such as 400/401/402/403/422 are never transient.
+    """
+    if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError):
+        response = getattr(exc, "response", None)
+        return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 2.0, jitter: bool = True) -> float:
+    """Return the sleep before retry number ``attempt`` (1-based).
+
+    The delay doubles per attempt up to ``cap``; with ``jitter`` a uniform
+    value in ``[0, delay]`` is used so concurrent clients do not retry in step.
+    """
+    delay = min(cap, base * (2 ** (attempt - 1)))
+    return random.uniform(0, delay) if jitter else delay
+
+
+def retry(
+    fn: Optional[Callable[..., T]] = None,
+    *,
+    max_attempts: int = 3,
+    base: float = 0.25,
+    cap: float = 2.0,
+    jitter: bool = True,
+    retry_if: Callable[[BaseException], bool] = is_transient_error,
+) -> Any:
+    """Retry ``fn`` on errors accepted by ``retry_if``.
+
+    Usable bare (``@retry``), with arguments (``@retry(max_attempts=5)``), or
+    inline (``retry(post)(url, ...)``). The last error is re-raised once
+    ``max_attempts`` calls have failed; errors rejected by ``retry_if`` are
+    raised immediately.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            attempt = 1
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as exc:
+                    if attempt >= max_attempts or not retry_if(exc):
+                        raise
+                    time.sleep(backoff_delay(attempt, base=base, cap=cap, jitter=jitter))
+                    attempt += 1
+
+        return wrapper
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
+
+
+class CircuitBreaker:
+    """Process-level circuit breaker for a remote dependency.
+
+    After ``failure_threshold`` consecutive failures accepted by
+    ``failure_if`` the breaker opens and ``execute`` raises
+    ``CircuitBreakerOpenError`` without calling through. Once
+    ``reset_timeout`` seconds have passed a single trial call is let through
+    (half-open); success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        failure_if: Callable[[BaseException], bool] = is_transient_error,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_if = failure_if
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being rejected."""
+        with self._lock:
+            return self._opened_at is not None and not self._reset_elapsed()
+
+    def _reset_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def execute(self, fn: Callable[[], T]) -> T:
+        """Call ``fn`` unless the breaker is open, recording the outcome."""
+        with self._lock:
+            if self._opened_at is not None:
+                if not self._reset_elapsed() or self._trial_in_flight:
+                    raise CircuitBreakerOpenError(
+                        "Cloud circuit breaker is open after repeated failures"
+                    )
+                self._trial_in_flight = True
+
+        try:
+            result = fn()
+        except Exception as exc:
+            with self._lock:
+                self._trial_in_flight = False
+                if self.failure_if(exc):
+                    self._failures += 1
+                    if self._opened_at is not None or self._failures >= self.failure_threshold:
+                        self._opened_at = time.monotonic()
+                else:
+                    # The service answered; a client error says nothing about availability.
+                    self._failures = 0
+                    self._opened_at = None
+            raise
+
+        with self._lock:
+            self._trial_in_flight = False
+            self._failures = 0
+            self._opened_at = None
+        return result
+
+    def reset(self) -> None:
+        """Close the breaker and forget recorded failures."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
@@ -0,0 +1,36 @@
+"""
+In-process cache for prompt/code/test file reads.
+
+Commands such as ``fix`` (one ``fix_main`` per unit test file) and ``test``
+read the same prompt and code files repeatedly through ``construct_paths``.
+Reads are cached on the file's identity and modification stamp, so an edit
+to the file (new mtime, ctime or size) naturally misses the cache.
+"""
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+from typing import Union
+
+
+@functools.lru_cache(maxsize=256)
+def _read_text(path: str, inode: int, mtime_ns: int, ctime_ns: int, size: int) -> str:
+    """Read ``path`` as UTF-8; the stat fields only participate in the cache key."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+def read_text_cached(path: Union[str, os.PathLike]) -> str:
+    """Return the UTF-8 text of ``path``, reusing the previous read if unchanged.
+
+    Raises the same ``OSError`` subclasses as ``Path.read_text`` when the file
+    is missing or unreadable.
+    """
+    resolved = os.path.realpath(os.path.expanduser(os.fspath(path)))
+    st = os.stat(resolved)
+    return _read_text(resolved, st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+
+def clear_file_cache() -> None:
+    """Drop all cached file contents."""
+    _read_text.cache_clear()
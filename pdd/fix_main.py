@@ -1,5 +1,6 @@
+import re
 import sys
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import json
 import click
 from rich import print as rprint
@@ -34,6 +35,40 @@ def _env_flag_enabled(name: str) -> bool:
         return False
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
 
+def _validate_fix(test_content: str, code_content: str, verbose: bool, source: str) -> bool:
+    """Write a suggested fix to a temp dir and return True when its tests pass.
+
+    Issue #158: success is decided by running the fixed tests rather than
+    trusting the LLM's update_unit_test/update_code flags.
+    """
+    import shutil
+    import tempfile
+
+    test_dir = tempfile.mkdtemp(prefix="pdd_fix_validate_")
+    temp_test_file = os.path.join(test_dir, "test_temp.py")
+    temp_code_file = os.path.join(test_dir, "code_temp.py")
+
+    try:
+        with open(temp_test_file, 'w') as f:
+            f.write(test_content)
+        with open(temp_code_file, 'w') as f:
+            f.write(code_content)
+
+        fails, errors, warnings, _test_output = run_pytest_on_file(temp_test_file)
+        success = (fails == 0 and errors == 0)
+
+        if verbose:
+            rprint(f"[cyan]Fix validation: {fails} failures, {errors} errors, {warnings} warnings[/cyan]")
+            if not success:
+                rprint(f"[yellow]Fix suggested by {source} did not pass tests[/yellow]")
+        return success
+    finally:
+        try:
+            shutil.rmtree(test_dir)
+        except Exception:
+            pass
+
+
 def fix_main(
     ctx: click.Context,
     prompt_file: str,
@@ -54,6 +89,8 @@ def fix_main(
     protect_tests: bool = False,
     test_files: list[str] | None = None,
     failure_aware_retries: bool = True,
+    prompt_content: Optional[str] = None,
+    code_content: Optional[str] = None,
 ) -> Tuple[bool, str, str, int, float, str]:
     """
     Main function to fix errors in code and unit tests.
@@ -74,6 +111,8 @@ def fix_main(
         auto_submit: Whether to auto-submit example if tests pass
         agentic_fallback: Whether the cli agent fallback is triggered
         failure_aware_retries: Whether loop mode uses failure-aware early exits
+        prompt_content: Pre-read prompt text; used instead of the file's content
+        code_content: Pre-read code text; used instead of the file's content
     Returns:
         Tuple containing:
         - Success status (bool)
@@ -122,6 +161,12 @@ def fix_main(
             context_override=ctx.obj.get('context'),
             confirm_callback=ctx.obj.get('confirm_callback')
         )
+        # Callers fixing several test files against the same prompt/code pass
+        # the already-read text so every file sees identical inputs.
+        if prompt_content is not None:
+            input_strings["prompt_file"] = prompt_content
+        if code_content is not None:
+            input_strings["code_file"] = code_content
 
         # Get parameters from context (prefer passed parameters over ctx.obj)
         strength = strength if strength is not None else ctx.obj.get('strength', DEFAULT_STRENGTH)
@@ -211,34 +256,12 @@ def fix_main(
 
                         # Validate the fix by running tests (same as local)
                         if update_unit_test or update_code:
-                            import tempfile
-                            import shutil as shutil_module
-
-                            test_dir = tempfile.mkdtemp(prefix="pdd_fix_validate_")
-                            temp_test_file = os.path.join(test_dir, "test_temp.py")
-                            temp_code_file = os.path.join(test_dir, "code_temp.py")
-
-                            try:
-                                test_content = fixed_unit_test if fixed_unit_test else input_strings["unit_test_file"]
-                                code_content = fixed_code if fixed_code else input_strings["code_file"]
-
-                                with open(temp_test_file, 'w') as f:
-                                    f.write(test_content)
-                                with open(temp_code_file, 'w') as f:
-                                    f.write(code_content)
-
-                                fails, errors_count, warnings, test_output = run_pytest_on_file(temp_test_file)
-                                success = (fails == 0 and errors_count == 0)
-
-                                if verbose:
-                                    rprint(f"[cyan]Fix validation: {fails} failures, {errors_count} errors, {warnings} warnings[/cyan]")
-                                    if not success:
-                                        rprint("[yellow]Fix suggested by cloud did not pass tests[/yellow]")
-                            finally:
-                                try:
-                                    shutil_module.rmtree(test_dir)
-                                except Exception:
-                                    pass
+                            success = _validate_fix(
+                                fixed_unit_test if fixed_unit_test else input_strings["unit_test_file"],
+                                fixed_code if fixed_code else input_strings["code_file"],
+                                verbose=verbose,
+                                source="cloud",
+                            )
                         else:
                             success = False
 
@@ -355,42 +378,13 @@ def fix_main(
             # Issue #158 fix: Validate the fix by running tests instead of
             # trusting the LLM's suggestion flags (update_unit_test/update_code)
             if update_unit_test or update_code:
-                # Write fixed files to temp location first, then run tests
-                import tempfile
-                import os as os_module
-
-                # Create temp files for testing
-                test_dir = tempfile.mkdtemp(prefix="pdd_fix_validate_")
-                temp_test_file = os_module.path.join(test_dir, "test_temp.py")
-                temp_code_file = os_module.path.join(test_dir, "code_temp.py")
-
-                try:
-                    # Write the fixed content (or original if not changed)
-                    test_content = fixed_unit_test if fixed_unit_test else input_strings["unit_test_file"]
-                    code_content = fixed_code if fixed_code else input_strings["code_file"]
-
-                    with open(temp_test_file, 'w') as f:
-                        f.write(test_content)
-                    with open(temp_code_file, 'w') as f:
-                        f.write(code_content)
-
-                    # Run pytest on the fixed test file to validate
-                    fails, errors, warnings, test_output = run_pytest_on_file(temp_test_file)
-
-                    # Success only if tests pass (no failures or errors)
-                    success = (fails == 0 and errors == 0)
-
-                    if verbose:
-                        rprint(f"[cyan]Fix validation: {fails} failures, {errors} errors, {warnings} warnings[/cyan]")
-                        if not success:
-                            rprint("[yellow]Fix suggested by LLM did not pass tests[/yellow]")
-                finally:
-                    # Cleanup temp files
-                    import shutil
-                    try:
-                        shutil.rmtree(test_dir)
-                    except Exception:
-                        pass
+                # Write the fixed content (or original if not changed) and run tests
+                success = _validate_fix(
+                    fixed_unit_test if fixed_unit_test else input_strings["unit_test_file"],
+                    fixed_code if fixed_code else input_strings["code_file"],
+                    verbose=verbose,
+                    source="LLM",
+                )
             else:
                 # No changes suggested by LLM
                 success = False
@@ -618,3 +612,204 @@ def fix_main(
                  rprint(f"[bold red]Error:[/bold red] {escape(str(e))}")
         # Return error result instead of sys.exit(1) to allow orchestrator to handle gracefully
         return False, "", "", 0, 0.0, f"Error: {e}"
+
+
+# Upper bound on test files folded into one LLM request so the combined
+# prompt stays well inside the model context window.
+BATCH_MAX = 8
+
+_BATCH_FILE_RE = re.compile(r'<file name="(?P<path>[^"]+)">\n?(?P<body>.*?)</file>', re.DOTALL)
+
+
+def _join_batch_tests(tests: Dict[str, str]) -> str:
+    """Concatenate test files, wrapping each in a ``<file name="<path>">`` tag."""
+    return "\n".join(f'<file name="{path}">\n{content}</file>' for path, content in tests.items())
+
+
+def _split_batch_tests(combined: str, expected: List[str]) -> Dict[str, str]:
+    """Split LLM output produced from ``_join_batch_tests`` back into ``{path: text}``.
+
+    Raises:
+        ValueError: If the output does not hold exactly one tagged file per
+            path in ``expected``; a partial split would silently drop fixes.
+    """
+    split: Dict[str, str] = {}
+    for match in _BATCH_FILE_RE.finditer(combined):
+        path = match.group("path").strip()
+        if path in split:
+            raise ValueError(f"Batched fix output contains '{path}' more than once.")
+        split[path] = match.group("body").strip("\n") + "\n"
+    if set(split) != set(expected):
+        missing = sorted(set(expected) - set(split))
+        unexpected = sorted(set(split) - set(expected))
+        raise ValueError(
+            "Batched fix output could not be split back into test files "
+            f"(missing: {missing or 'none'}; unexpected: {unexpected or 'none'})."
+        )
+    return split
+
+
+def fix_main_batch(
+    ctx: click.Context,
+    prompt_file: str,
+    code_file: str,
+    unit_test_files: List[str],
+    error_file: str,
+    output_test: Optional[str],
+    output_code: Optional[str],
+    output_results: Optional[str],
+    budget: float,
+    strength: Optional[float] = None,
+    temperature: Optional[float] = None,
+    protect_tests: bool = False,
+) -> Tuple[Dict[str, Tuple[bool, str]], str, int, float, str]:
+    """
+    Fix several unit test files for one prompt/code pair with batched LLM calls.
+
+    Instead of one ``fix_main`` round-trip per test file, up to ``BATCH_MAX``
+    test files are concatenated (each wrapped in a ``<file name="<path>">``
+    tag) and sent in a single ``fix_errors_from_unit_tests`` call. The fixed
+    test text is split back per file by the same tags; if the split does not
+    match the batch, a ValueError is raised before anything is written. Only
+    local single-pass (non-loop) fixing is supported: there is no cloud
+    attempt, agentic fallback or auto-submit. ``output_test`` must be None or
+    a directory so every test file keeps its own output path, and every test
+    file must resolve to the same fixed-code and results paths.
+
+    Args:
+        ctx: Click context containing command-line parameters
+        prompt_file: Path to the prompt file that generated the code
+        code_file: Path to the code file to be fixed
+        unit_test_files: Paths to the unit test files
+        error_file: Path to the error log file shared by all test files
+        output_test: Optional directory for the fixed unit test files
+        output_code: Path to save the fixed code file
+        output_results: Path to save the fix results
+        budget: Maximum cost allowed across all batches
+        strength: Optional override for LLM strength
+        temperature: Optional override for LLM temperature
+        protect_tests: If True, never write fixed unit test files
+
+    Returns:
+        Tuple containing:
+        - Mapping of unit test path to (success, output test path); files whose
+          batch was skipped because the budget ran out are left out
+        - Fixed source code (str)
+        - Number of LLM fix calls made (int)
+        - Total cost of operation (float)
+        - Name of model used (str)
+    """
+    if not Path(error_file).exists():
+        raise FileNotFoundError(f"Error file '{error_file}' does not exist.")
+
+    strength = strength if strength is not None else ctx.obj.get('strength', DEFAULT_STRENGTH)
+    temperature = temperature if temperature is not None else ctx.obj.get('temperature', 0)
+    verbose = ctx.obj.get('verbose', False)
+    time = ctx.obj.get('time')
+
+    # Resolve inputs and per-file output paths locally; only the LLM call is batched.
+    test_contents: Dict[str, str] = {}
+    output_tests: Dict[str, str] = {}
+    shared_outputs: Dict[str, set] = {"output_code": set(), "output_results": set()}
+    input_strings: Dict[str, str] = {}
+    for unit_test_file in unit_test_files:
+        _, input_strings, output_file_paths, _ = construct_paths(
+            input_file_paths={
+                "prompt_file": prompt_file,
+                "code_file": code_file,
+                "unit_test_file": unit_test_file,
+                "error_file": error_file,
+            },
+            force=ctx.obj.get('force', False),
+            quiet=ctx.obj.get('quiet', False),
+            command="fix",
+            command_options={
+                "output_test": output_test,
+                "output_code": output_code,
+                "output_results": output_results,
+            },
+            create_error_file=False,
+            context_override=ctx.obj.get('context'),
+            confirm_callback=ctx.obj.get('confirm_callback'),
+        )
+        test_contents[unit_test_file] = input_strings["unit_test_file"]
+        output_tests[unit_test_file] = output_file_paths["output_test"]
+        for key, paths in shared_outputs.items():
+            paths.add(output_file_paths.get(key))
+
+    # Every batch shares one fixed code file and one results file.
+    for key, paths in shared_outputs.items():
+        if len(paths) > 1:
+            option = "--" + key.replace("_", "-")
+            raise click.UsageError(
+                f"--batch needs one {option} path for all test files, but they resolve to "
+                f"{', '.join(sorted(str(path) for path in paths))}; pass {option} explicitly."
+            )
+    output_code_path = shared_outputs["output_code"].pop()
+    output_results_path = shared_outputs["output_results"].pop()
+
+    code = input_strings["code_file"]
+    fixed_code = ""
+    fixed_tests: Dict[str, str] = {}
+    attempts = 0
+    total_cost = 0.0
+    model_name = ""
+    # Whether the batch holding each test file changed anything; files whose
+    # batch never ran for lack of budget are absent.
+    batch_changed: Dict[str, bool] = {}
+
+    for start in range(0, len(unit_test_files), BATCH_MAX):
+        if total_cost >= budget:
+            if verbose:
+                rprint(f"[yellow]Budget of ${budget:.2f} exhausted; skipping remaining test files.[/yellow]")
+            break
+        batch = {path: test_contents[path] for path in unit_test_files[start:start + BATCH_MAX]}
+        if verbose:
+            console.print(Panel(
+                f"Fixing {len(batch)} test files in one request...",
+                title="[blue]Mode[/blue]",
+                expand=False,
+            ))
+        update_unit_test, update_code, batch_fixed_tests, batch_fixed_code, _, cost, model_name = fix_errors_from_unit_tests(
+            unit_test=_join_batch_tests(batch),
+            code=fixed_code or code,
+            prompt=input_strings["prompt_file"],
+            error=input_strings["error_file"],
+            error_file=output_results_path,
+            strength=strength,
+            temperature=temperature,
+            time=time,
+            verbose=verbose,
+            protect_tests=protect_tests,
+        )
+        attempts += 1
+        total_cost += cost
+        batch_changed.update(dict.fromkeys(batch, bool(update_unit_test or update_code)))
+        if batch_fixed_tests:
+            fixed_tests.update(_split_batch_tests(batch_fixed_tests, list(batch)))
+        if batch_fixed_code:
+            fixed_code = batch_fixed_code
+
+    results: Dict[str, Tuple[bool, str]] = {}
+    for unit_test_file, changed in batch_changed.items():
+        fixed_test = fixed_tests.get(unit_test_file, "")
+        success = changed and _validate_fix(
+            fixed_test or test_contents[unit_test_file],
+            fixed_code or code,
+            verbose=verbose,
+            source="LLM",
+        )
+        if fixed_test and not protect_tests:
+            output_test_path = Path(output_tests[unit_test_file])
+            output_test_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_test_path, 'w') as f:
+                f.write(fixed_test)
+        results[unit_test_file] = (success, output_tests[unit_test_file])
+
+    if fixed_code:
+        code_path = Path(output_code_path)
+        code_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(code_path, 'w') as f:
+            f.write(fixed_code)
+
+    return results, fixed_code, attempts, total_cost, model_name
@@ -3,13 +3,28 @@ Module for generating unit tests from code or example files using LLMs.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import importlib.resources
+import json
+import os
 import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional, Tuple
 
 from rich.console import Console
 from rich.markdown import Markdown
 
-from pdd import DEFAULT_STRENGTH, DEFAULT_TIME, EXTRACTION_STRENGTH
+from pdd import (
+    DEFAULT_STRENGTH,
+    DEFAULT_TIME,
+    EXTRACTION_STRENGTH,
+    VERIFICATION_STRENGTH,
+    VERIFICATION_TIME,
+)
 from pdd.continue_generation import continue_generation
 from pdd.llm_invoke import llm_invoke
 from pdd.load_prompt_template import load_prompt_template
@@ -19,26 +34,30 @@ from pdd.unfinished_prompt import unfinished_prompt
 
 console = Console()
 
+# Fenced code block with an optional language tag; used when postprocess fails
+_CODE_BLOCK_RE = re.compile(r"```(?:\w+)?\n(.*?)```", re.DOTALL)
 
-def _validate_inputs(
-    prompt: str,
-    code: Optional[str],
-    strength: float,
-    temperature: float,
-    language: str
-) -> None:
-    """
-    Validates the inputs for generate_test function.
+# Opt-in on-disk cache of deterministic (temperature 0) generate_test results
+RESULT_CACHE_ENV = "PDD_GENERATE_TEST_CACHE"
+RESULT_CACHE_DIR_ENV = "PDD_GENERATE_TEST_CACHE_DIR"
 
-    Raises:
-        ValueError: If any input is invalid.
+# Verbose output longer than this is printed raw instead of rendered as Markdown
+_MARKDOWN_RENDER_LIMIT = 50_000
+
+# Markers showing a fenced block holds code rather than prose or sample output
+_CODE_SENTINELS = ("def ", "import ", "require(", "describe(", "#include", "@Test", "func Test")
+
+
+def _validate_settings(strength: float, temperature: float, language: str) -> None:
     """
-    if not isinstance(prompt, str) or not prompt.strip():
-        raise ValueError("Prompt must be a non-empty string")
+    Validates the model settings and language for generate_test.
 
-    if code is None or not isinstance(code, str) or not code.strip():
-        raise ValueError("Code must be a non-empty string")
+    Empty code or example text is allowed here so tests can still be
+    generated from stub files.
 
+    Raises:
+        ValueError: If any setting is invalid.
+    """
     if not isinstance(strength, (int, float)) or not 0 <= strength <= 1:
         raise ValueError("Strength must be a float between 0 and 1")
 
@@ -119,6 +138,103 @@ def _inject_sys_path_preamble(code: str) -> str:
     return "\n".join(lines)
 
 
+def _model_config_key() -> Tuple[Optional[str], str]:
+    """Return what decides llm_invoke's model choice: the default base model and model CSV.
+
+    The CSV is keyed by a digest of its bytes, so editing it or switching to a
+    different one invalidates cached results.
+    """
+    llm_module = importlib.import_module("pdd.llm_invoke")
+    csv_path = llm_module.LLM_MODEL_CSV_PATH
+    try:
+        if csv_path is not None and csv_path.exists():
+            csv_bytes = csv_path.read_bytes()
+        else:
+            csv_bytes = importlib.resources.files("pdd").joinpath("data/llm_model.csv").read_bytes()
+        csv_digest = hashlib.blake2b(csv_bytes, digest_size=16).hexdigest()
+    except OSError:
+        csv_digest = str(csv_path)
+    return llm_module.DEFAULT_BASE_MODEL, csv_digest
+
+
+def _result_cache_path(*key_parts: object) -> Optional[Path]:
+    """Return the cache file for a generate_test request, or None when caching is off.
+
+    The file name is a BLAKE2b digest of every input that shapes the result,
+    including the preprocessed template and the model configuration, so
+    template or model changes invalidate it.
+    """
+    if os.environ.get(RESULT_CACHE_ENV) != "1":
+        return None
+    cache_dir = os.environ.get(RESULT_CACHE_DIR_ENV) or os.path.join("~", ".cache", "pdd", "generate_test")
+    key = (*key_parts, _model_config_key())
+    digest = hashlib.blake2b(
+        json.dumps(key, default=str).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return Path(cache_dir).expanduser() / f"{digest}.json"
+
+
+def _read_cached_result(path: Path) -> Optional[Tuple[str, str]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data["unit_test"], data["model_name"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached_result(path: Path, unit_test: str, model_name: str) -> None:
+    """Write a cache entry atomically; cache failures never fail generation."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"unit_test": unit_test, "model_name": model_name}, handle)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
+
+
+def _single_code_block(text: str) -> Optional[str]:
+    """Return the code of ``text``'s only fenced block, or None if extraction is ambiguous.
+
+    A lone block containing a code marker needs no LLM extraction.
+    """
+    blocks = _CODE_BLOCK_RE.findall(text)
+    if len(blocks) == 1 and any(sentinel in blocks[0] for sentinel in _CODE_SENTINELS):
+        return blocks[0].strip()
+    return None
+
+
+def _ends_with_closed_fence(text: str) -> bool:
+    """Return True when ``text`` ends by closing a balanced markdown code fence.
+
+    A truncated generation stops inside a block, leaving an odd number of
+    fences or trailing code after the last one.
+    """
+    fences = text.count("```")
+    return fences >= 2 and fences % 2 == 0 and text.rstrip().endswith("```")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_preprocessed_template(name: str) -> str:
+    """Load and preprocess a prompt template, caching the result by name.
+
+    Load failures raise and are therefore not cached.
+    """
+    raw_template = load_prompt_template(name)
+    if not raw_template:
+        raise ValueError(f"Failed to load {name} prompt template")
+    return preprocess(
+        raw_template,
+        recursive=False,
+        double_curly_brackets=False
+    )
+
+
 def generate_test(
     prompt: str,
     code: Optional[str] = None,
@@ -162,20 +278,27 @@ def generate_test(
     # --- Step 1: Determine prompt template and validate inputs ---
     if (code is None and example is None) or (code is not None and example is not None):
         raise ValueError("Exactly one of 'code' or 'example' must be provided.")
+    _validate_settings(strength, temperature, language)
 
     template_name = "generate_test_from_example_LLM" if example else "generate_test_LLM"
 
-    raw_template = load_prompt_template(template_name)
-    if not raw_template:
-        raise ValueError(f"Failed to load {template_name} prompt template")
-
     # --- Step 2: Preprocess template and prompt ---
-    # Preprocess the template
-    prompt_template = preprocess(
-        raw_template,
-        recursive=False,
-        double_curly_brackets=False
-    )
+    # The template is static, so it is loaded and preprocessed once per process
+    prompt_template = _load_preprocessed_template(template_name)
+
+    # Identical deterministic requests can be served from the result cache
+    cache_path = None
+    if temperature == 0:
+        cache_path = _result_cache_path(
+            prompt_template, prompt, code, example, language, strength, time,
+            source_file_path, test_file_path, module_name, existing_tests,
+        )
+    if cache_path is not None:
+        cached = _read_cached_result(cache_path)
+        if cached is not None:
+            if verbose:
+                console.print(f"[dim]Using cached result from {cache_path}[/dim]")
+            return cached[0], 0.0, cached[1]
 
     # Preprocess the original prompt input
     processed_prompt_input = preprocess(
@@ -188,10 +311,10 @@ def generate_test(
     input_data = {
         "prompt_that_generated_code": processed_prompt_input,
         "language": language,
-        "source_file_path": source_file_path if source_file_path else "",
-        "test_file_path": test_file_path if test_file_path else "",
-        "module_name": module_name if module_name else "",
-        "existing_tests": existing_tests if existing_tests else ""
+        "source_file_path": source_file_path or "",
+        "test_file_path": test_file_path or "",
+        "module_name": module_name or "",
+        "existing_tests": existing_tests or ""
     }
 
     if example:
@@ -225,83 +348,115 @@ def generate_test(
     # --- Step 4: Verbose Output of Initial Result ---
     if verbose:
         console.print("[bold green]Initial LLM Output:[/bold green]")
-        console.print(Markdown(current_text))
+        if len(current_text) <= _MARKDOWN_RENDER_LIMIT:
+            console.print(Markdown(current_text))
+        else:
+            # Parsing very large outputs as Markdown is slow; print them raw
+            console.print(current_text, markup=False, highlight=False)
         console.print(f"[dim]Initial Cost: ${llm_result.get('cost', 0.0):.6f}[/dim]")
 
     # --- Step 5: Detect incomplete generation ---
-    # Check the last 600 characters
-    last_chunk = current_text[-600:] if len(current_text) > 600 else current_text
-
-    # Only check if there is actual content
-    if last_chunk.strip():
+    # Check the last 600 non-trailing-whitespace characters. Only a bounded
+    # window is stripped so long outputs are never copied in full.
+    last_chunk = current_text[-1200:].rstrip()[-600:]
+
+    def _extract(text: str) -> Tuple[str, float]:
+        block = _single_code_block(text)
+        if block is not None:
+            return block, 0.0
         try:
-            reasoning, is_finished, check_cost, _ = unfinished_prompt(
-                prompt_text=last_chunk,
-                strength=strength,
-                temperature=temperature,
-                time=time,
+            extracted_code, pp_cost, _ = postprocess(
+                llm_output=text,
                 language=language,
+                strength=EXTRACTION_STRENGTH,
+                time=0.0,
                 verbose=verbose
             )
-            total_cost += check_cost
-
-            if not is_finished:
-                if verbose:
-                    console.print(
-                        "[yellow]Output detected as incomplete. Continuing generation...[/yellow]"
-                    )
-                    console.print(f"[dim]Reasoning: {reasoning}[/dim]")
-
-                # We need the formatted prompt for continue_generation.
-                # Since llm_invoke handles formatting internally, we attempt to format here
-                # to pass context to the continuation logic.
-                try:
-                    formatted_input_prompt = prompt_template.format(**input_data)
-                except Exception:
-                    # Fallback if simple formatting fails (e.g. complex jinja or missing keys)
-                    # We use the raw template as best effort context
-                    formatted_input_prompt = prompt_template
-
-                final_llm_output, cont_cost, cont_model = continue_generation(
-                    formatted_input_prompt=formatted_input_prompt,
-                    llm_output=current_text,
-                    strength=strength,
+            return extracted_code, pp_cost
+        except Exception as e:
+            if verbose:
+                console.print(f"[bold red]Postprocessing failed:[/bold red] {e}")
+            return "", 0.0
+
+    extracted: Optional[Tuple[str, float]] = None
+
+    # Only check if there is actual content. Output that closes its last code
+    # fence is finished; skip the LLM round-trip for that common case.
+    if last_chunk.strip() and not _ends_with_closed_fence(current_text):
+        continued = False
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The output is usually complete, so extract it speculatively
+            # while the completion check is in flight.
+            speculative = executor.submit(_extract, current_text)
+            try:
+                reasoning, is_finished, check_cost, _ = unfinished_prompt(
+                    prompt_text=last_chunk,
+                    strength=VERIFICATION_STRENGTH,
                     temperature=temperature,
+                    time=VERIFICATION_TIME,
+                    language=language,
                     verbose=verbose
                 )
+                total_cost += check_cost
+
+                if not is_finished:
+                    if verbose:
+                        console.print(
+                            "[yellow]Output detected as incomplete. Continuing generation...[/yellow]"
+                        )
+                        console.print(f"[dim]Reasoning: {reasoning}[/dim]")
+
+                    # continue_generation needs the formatted prompt; reuse the
+                    # one llm_invoke already rendered when it is reported.
+                    formatted_input_prompt = llm_result.get('rendered_prompt')
+                    if not formatted_input_prompt:
+                        try:
+                            formatted_input_prompt = prompt_template.format(**input_data)
+                        except Exception:
+                            # Fallback if simple formatting fails (e.g. complex jinja or missing keys)
+                            # We use the raw template as best effort context
+                            formatted_input_prompt = prompt_template
+
+                    final_llm_output, cont_cost, cont_model = continue_generation(
+                        formatted_input_prompt=formatted_input_prompt,
+                        llm_output=current_text,
+                        strength=strength,
+                        temperature=temperature,
+                        verbose=verbose
+                    )
 
-                current_text = final_llm_output
-                total_cost += cont_cost
-                model_name = cont_model # Update to the model used for continuation
-        except Exception as e:
-            console.print(f"[bold red]Error during completion check/continuation:[/bold red] {e}")
-            # Proceed with what we have if check fails
+                    current_text = final_llm_output
+                    continued = True
+                    total_cost += cont_cost
+                    model_name = cont_model # Update to the model used for continuation
+            except Exception as e:
+                console.print(f"[bold red]Error during completion check/continuation:[/bold red] {e}")
+                # Proceed with what we have if check fails
 
-    # --- Step 6: Postprocess ---
-    try:
-        extracted_code, pp_cost, _ = postprocess(
-            llm_output=current_text,
-            language=language,
-            strength=EXTRACTION_STRENGTH,
-            verbose=verbose
-        )
-        total_cost += pp_cost
-        unit_test = extracted_code
-    except Exception as e:
-        if verbose:
-            console.print(f"[bold red]Postprocessing failed:[/bold red] {e}")
-        unit_test = ""
+        extracted = speculative.result()
+        # A discarded speculative extraction was still paid for.
+        total_cost += extracted[1]
+        if continued:
+            extracted = None
 
-    # Fallback extraction if postprocess returned empty or failed
-    if not unit_test.strip():
+    # --- Step 6: Postprocess ---
+    if extracted is None:
+        extracted = _extract(current_text)
+        total_cost += extracted[1]
+    unit_test = extracted[0]
+
+    # Fallback extraction if postprocess returned empty, failed, or left the
+    # markdown fences in place. Only the ends are checked: a failed extraction
+    # shows its fences there, so the success path stays O(1).
+    stripped = unit_test.strip()
+    if not stripped or stripped.startswith("```") or stripped.endswith("```"):
         if verbose:
             console.print(
-                "[yellow]Postprocess returned empty. Attempting fallback regex extraction.[/yellow]"
+                "[yellow]Postprocess returned no clean code. Attempting fallback regex extraction.[/yellow]"
             )
 
-        # Regex to find code blocks, preferring those with specific keywords
-        code_block_pattern = re.compile(r"```(?:\w+)?\n(.*?)```", re.DOTALL)
-        matches = code_block_pattern.findall(current_text)
+        # Find code blocks, preferring those with specific keywords
+        matches = _CODE_BLOCK_RE.findall(current_text)
 
         best_match = ""
         for match in matches:
@@ -326,5 +481,35 @@ def generate_test(
         console.print(f"[bold]Total Cost:[/bold] ${total_cost:.6f}")
         console.print(f"[dim]Final Model: {model_name}[/dim]")
 
+    if cache_path is not None and unit_test.strip():
+        _write_cached_result(cache_path, unit_test, model_name)
+
     # --- Step 8: Return ---
-    return unit_test, total_cost, model_name
\ No newline at end of file
+    return unit_test, total_cost, model_name
+
+
+async def agenerate_test(
+    prompt: str,
+    code: Optional[str] = None,
+    example: Optional[str] = None,
+    **kwargs,
+) -> Tuple[str, float, str]:
+    """
+    Awaitable variant of :func:`generate_test`.
+
+    The LLM helpers are synchronous, so the whole pipeline runs in the default
+    thread pool. This lets batch callers overlap the network round-trips of
+    several generation jobs::
+
+        results = await asyncio.gather(
+            *(agenerate_test(p, code=c) for p, c in jobs)
+        )
+
+    Accepts the same keyword arguments as :func:`generate_test` and returns
+    the same ``(unit_test, total_cost, model_name)`` tuple.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        functools.partial(generate_test, prompt, code=code, example=example, **kwargs),
+    )
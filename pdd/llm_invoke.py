@@ -1,7 +1,6 @@
 # Corrected code_under_test (llm_invoke.py)
 # Added optional debugging prints in _select_model_candidates
 
-import copy
 import getpass
 import os
 import pandas as pd
@@ -2378,6 +2377,10 @@ _PROVIDER_PREFIX_TO_PROVIDER = {
     "azure_ai/": "Azure AI",
 }
 
+# Providers (lower-cased `llm_model.csv` provider names) that need Groq's
+# JSON-mode structured output handling instead of tool-based schemas.
+_GROQ_PROVIDERS = frozenset({"groq"})
+
 
 def _is_permanent_invalid_request_error(exc: Exception) -> bool:
     """Classify whether an exception represents a permanent parameter
@@ -3317,7 +3320,9 @@ def llm_invoke(
         use_cloud: None=auto-detect (cloud if enabled, local if PDD_FORCE_LOCAL=1), True=force cloud, False=force local.
 
     Returns:
-        Dictionary containing 'result', 'cost', 'model_name', 'thinking_output'.
+        Dictionary containing 'result', 'cost', 'model_name', 'thinking_output'
+        and 'rendered_prompt' (the formatted prompt string; None when
+        'messages' or batch mode is used).
 
     Raises:
         ValueError: For invalid inputs or prompt formatting errors.
@@ -3365,6 +3370,12 @@ def llm_invoke(
     else:
         raise ValueError("Either 'messages' or both 'prompt' and 'input_json' must be provided.")
 
+    # Returned so callers that continue a generation can reuse the formatted
+    # prompt instead of formatting the template a second time.
+    rendered_prompt: Optional[str] = (
+        formatted_messages[0]["content"] if messages is None and not use_batch_mode else None
+    )
+
     # --- 1. Cloud Execution Path ---
     # Determine cloud usage: explicit param > environment > default (local)
     if use_cloud is None:
@@ -3502,6 +3513,7 @@ def llm_invoke(
                 _publish_attempted_models()
             if isinstance(cloud_result, dict):
                 cloud_result.setdefault("attempted_models", list(attempted_models))
+                cloud_result.setdefault("rendered_prompt", rendered_prompt)
             return cloud_result
         except CloudFallbackError as e:
             # Notify user and fall back to local execution
@@ -3707,7 +3719,14 @@ def llm_invoke(
             # --- 5. Prepare LiteLLM Arguments ---
             litellm_kwargs: Dict[str, Any] = {
                 "model": model_name_litellm,
-                "messages": copy.deepcopy(formatted_messages),
+                # Per-message shallow copies: branches below replace message
+                # dicts/content but never mutate nested values in place.
+                # Batch mode carries one message list per conversation.
+                "messages": (
+                    [[dict(m) for m in conversation] for conversation in formatted_messages]
+                    if use_batch_mode
+                    else [dict(m) for m in formatted_messages]
+                ),
                 # Retry on transient network errors (APIError, TimeoutError, ServiceUnavailableError)
                 "num_retries": 2,
             }
@@ -3780,7 +3799,7 @@ def llm_invoke(
             model_name_lower = str(model_name_litellm).lower()
             provider_lower_for_model = provider.lower()
             is_lm_studio = model_name_lower.startswith('lm_studio/') or provider_lower_for_model == 'lm_studio'
-            is_groq = model_name_lower.startswith('groq/') or provider_lower_for_model == 'groq'
+            is_groq = model_name_lower.startswith('groq/') or provider_lower_for_model in _GROQ_PROVIDERS
             if is_lm_studio:
                 # Ensure base_url is set (fallback to env LM_STUDIO_API_BASE or localhost)
                 if not litellm_kwargs.get("base_url"):
@@ -3883,9 +3902,12 @@ def llm_invoke(
                         schema_instruction = f"You must respond with valid JSON matching this schema:\n```json\n{json.dumps(schema, indent=2)}\n```\nRespond ONLY with the JSON object, no other text."
 
                         # Find or create system message to prepend schema
-                        messages_list = litellm_kwargs.get("messages", [])
+                        messages_list = list(litellm_kwargs.get("messages", []))
                         if messages_list and messages_list[0].get("role") == "system":
-                            messages_list[0]["content"] = schema_instruction + "\n\n" + messages_list[0]["content"]
+                            messages_list[0] = {
+                                **messages_list[0],
+                                "content": schema_instruction + "\n\n" + messages_list[0]["content"],
+                            }
                         else:
                             messages_list.insert(0, {"role": "system", "content": schema_instruction})
                         litellm_kwargs["messages"] = messages_list
@@ -4212,6 +4234,7 @@ def llm_invoke(
                             'thinking_output': None,
                             'finish_reason': finish_reason,
                             'attempted_models': list(attempted_models),
+                            'rendered_prompt': rendered_prompt,
                         }
                     except Exception as e:
                         last_exception = e
@@ -4878,6 +4901,7 @@ def llm_invoke(
                     'thinking_output': final_thinking if final_thinking else None,
                     'finish_reason': _LAST_CALLBACK_DATA.get("finish_reason"),
                     'attempted_models': list(attempted_models),
+                    'rendered_prompt': rendered_prompt,
                 }
 
             # --- 6b. Handle Invocation Errors ---
@@ -1,6 +1,7 @@
 """Project-level pytest configuration hooks."""
 
 import atexit
+import itertools
 import os
 import shutil
 import sys
@@ -167,6 +168,24 @@ def restore_agentic_e2e_fix_orchestrator_mocks():
         setattr(orchestrator, attr, original)
 
 
+@pytest.fixture(autouse=True)
+def clear_in_process_jwt():
+    """Keep the in-process JWT memo in ``pdd.core.cloud`` from leaking between tests.
+
+    Tests that mock ``_get_cached_jwt`` or the device flow with a JWT carrying
+    a future ``exp`` would otherwise satisfy later tests' token lookups
+    without calling their mocks.
+    """
+    try:
+        from pdd.core.cloud import clear_jwt_memo
+    except ImportError:
+        yield
+        return
+    clear_jwt_memo()
+    yield
+    clear_jwt_memo()
+
+
 @pytest.fixture(autouse=True)
 def preserve_cwd():
     """Restore cwd after each test so xdist workers don't leak temp dirs.
@@ -524,6 +543,51 @@ def create_dummy_files(tmp_path):
     return _create_files
 
 
+@pytest.fixture(scope="session")
+def session_dummy_files(tmp_path_factory):
+    """Like ``create_dummy_files`` but each file is written once per session.
+
+    Only for tests that never modify the files. Files are keyed on
+    ``(name, content)``, so tests asking for the same name with different
+    content get separate files.
+    """
+    root = tmp_path_factory.mktemp("dummy_prompts")
+    cache = {}
+
+    def _create_files(*filenames, content="dummy content"):
+        files = {}
+        for name in filenames:
+            key = (name, content)
+            if key not in cache:
+                file_path = root / str(len(cache)) / name
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text(content)
+                cache[key] = file_path
+            files[name] = cache[key]
+        return files
+    return _create_files
+
+
+_SCRATCH_IDS = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def _scratch_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("scratch")
+
+
+@pytest.fixture
+def scratch(_scratch_root):
+    """Fresh per-test directory under a single session-wide root.
+
+    A lighter alternative to ``tmp_path`` for tests that only write a few
+    small files: it skips pytest's per-test numbered-directory bookkeeping.
+    """
+    path = _scratch_root / str(next(_SCRATCH_IDS))
+    path.mkdir()
+    return path
+
+
 @pytest.fixture
 def runner():
     """Fixture to provide a CliRunner for testing Click commands."""
@@ -619,3 +619,57 @@ def test_async_context_auth_error_references_correct_command(clean_env):
                 "AuthError in async context should reference 'pdd auth login', "
                 f"not 'pdd login'. Got: {printed}"
             )
+
+
+# -----------------------------------------------------------------------------
+# Unit Tests: In-process JWT memo
+# -----------------------------------------------------------------------------
+
+def _make_jwt(exp: float, aud: str = "prompt-driven-development") -> str:
+    import base64
+    import json as _json
+
+    def _seg(obj):
+        return base64.urlsafe_b64encode(_json.dumps(obj).encode()).rstrip(b"=").decode()
+
+    return f"{_seg({'alg': 'none'})}.{_seg({'exp': exp, 'aud': aud})}.sig"
+
+
+@patch("pdd.core.cloud._get_cached_jwt")
+def test_get_jwt_token_memoizes_until_exp(mock_get_cached_jwt, clean_env):
+    """A token with a future exp is reused without re-reading the disk cache."""
+    import time
+
+    token = _make_jwt(time.time() + 3600)
+    mock_get_cached_jwt.return_value = token
+
+    assert CloudConfig.get_jwt_token() == token
+    assert CloudConfig.get_jwt_token() == token
+    mock_get_cached_jwt.assert_called_once()
+
+
+@patch("pdd.core.cloud._get_cached_jwt")
+def test_get_jwt_token_skips_memo_near_expiry(mock_get_cached_jwt, clean_env):
+    """Tokens inside the safety margin of their exp are not memoized."""
+    import time
+
+    mock_get_cached_jwt.return_value = _make_jwt(time.time() + 10)
+
+    CloudConfig.get_jwt_token()
+    CloudConfig.get_jwt_token()
+    assert mock_get_cached_jwt.call_count == 2
+
+
+@patch("pdd.core.cloud._get_cached_jwt")
+def test_get_jwt_token_memo_invalidated_by_env_switch(mock_get_cached_jwt, clean_env):
+    """Switching PDD_ENV (expected audience) bypasses the memoized token."""
+    import time
+
+    prod_token = _make_jwt(time.time() + 3600)
+    staging_token = _make_jwt(time.time() + 3600, aud="prompt-driven-development-stg")
+    mock_get_cached_jwt.side_effect = [prod_token, staging_token]
+
+    with patch.dict(os.environ, {"PDD_ENV": "prod"}):
+        assert CloudConfig.get_jwt_token() == prod_token
+    with patch.dict(os.environ, {"PDD_ENV": "staging"}):
+        assert CloudConfig.get_jwt_token() == staging_token
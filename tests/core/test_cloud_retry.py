@@ -0,0 +1,130 @@
+"""Tests for cloud retry/backoff and the circuit breaker."""
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from pdd.core import cloud_retry
+from pdd.core.cloud_retry import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    backoff_delay,
+    is_transient_error,
+    retry,
+)
+
+
+def _http_error(status_code):
+    response = MagicMock(spec=requests.Response)
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(cloud_retry.time, "sleep", sleeps.append)
+    return sleeps
+
+
+class TestIsTransientError:
+    """Tests for is_transient_error."""
+
+    @pytest.mark.parametrize("exc", [
+        requests.exceptions.Timeout(),
+        requests.exceptions.ConnectionError(),
+        _http_error(502),
+        _http_error(503),
+        _http_error(504),
+    ])
+    def test_transient(self, exc):
+        assert is_transient_error(exc)
+
+    @pytest.mark.parametrize("exc", [
+        _http_error(400),
+        _http_error(401),
+        _http_error(403),
+        _http_error(422),
+        _http_error(500),
+        ValueError("boom"),
+    ])
+    def test_not_transient(self, exc):
+        assert not is_transient_error(exc)
+
+
+class TestRetry:
+    """Tests for the retry decorator."""
+
+    def test_backoff_is_capped(self):
+        assert backoff_delay(1, base=0.25, cap=2.0, jitter=False) == 0.25
+        assert backoff_delay(3, base=0.25, cap=2.0, jitter=False) == 1.0
+        assert backoff_delay(10, base=0.25, cap=2.0, jitter=False) == 2.0
+        assert 0 <= backoff_delay(10, base=0.25, cap=2.0) <= 2.0
+
+    def test_retries_transient_then_succeeds(self, no_sleep):
+        fn = MagicMock(side_effect=[requests.exceptions.Timeout(), "ok"])
+        assert retry(fn)() == "ok"
+        assert fn.call_count == 2
+        assert len(no_sleep) == 1
+
+    def test_gives_up_after_max_attempts(self, no_sleep):
+        fn = MagicMock(side_effect=requests.exceptions.ConnectionError())
+        with pytest.raises(requests.exceptions.ConnectionError):
+            retry(max_attempts=3)(fn)()
+        assert fn.call_count == 3
+        assert len(no_sleep) == 2
+
+    def test_non_retryable_raises_immediately(self, no_sleep):
+        fn = MagicMock(side_effect=_http_error(401))
+        with pytest.raises(requests.exceptions.HTTPError):
+            retry(fn)()
+        assert fn.call_count == 1
+        assert no_sleep == []
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold_and_rejects(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+        fn = MagicMock(side_effect=requests.exceptions.Timeout())
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.Timeout):
+                breaker.execute(fn)
+        assert breaker.is_open
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.execute(fn)
+        assert fn.call_count == 2
+
+    def test_client_errors_do_not_trip(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        with pytest.raises(requests.exceptions.HTTPError):
+            breaker.execute(MagicMock(side_effect=_http_error(403)))
+        assert not breaker.is_open
+
+    def test_half_open_trial_closes_on_success(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(cloud_retry.time, "monotonic", lambda: clock[0])
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        with pytest.raises(requests.exceptions.Timeout):
+            breaker.execute(MagicMock(side_effect=requests.exceptions.Timeout()))
+        assert breaker.is_open
+
+        clock[0] += 31.0
+        assert breaker.execute(lambda: "ok") == "ok"
+        assert not breaker.is_open
+
+    def test_half_open_trial_failure_reopens(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(cloud_retry.time, "monotonic", lambda: clock[0])
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        failing = MagicMock(side_effect=requests.exceptions.Timeout())
+        for _ in range(3):
+            with pytest.raises(requests.exceptions.Timeout):
+                breaker.execute(failing)
+
+        clock[0] += 31.0
+        with pytest.raises(requests.exceptions.Timeout):
+            breaker.execute(failing)
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.execute(failing)
@@ -0,0 +1,44 @@
+"""Tests for the mtime-keyed file read cache."""
+import os
+
+import pytest
+
+from pdd.core.file_cache import _read_text, clear_file_cache, read_text_cached
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_file_cache()
+    yield
+    clear_file_cache()
+
+
+class TestReadTextCached:
+    """Tests for read_text_cached."""
+
+    def test_returns_file_text(self, tmp_path):
+        path = tmp_path / "prompt.prompt"
+        path.write_text("héllo", encoding="utf-8")
+        assert read_text_cached(path) == "héllo"
+
+    def test_unchanged_file_is_read_once(self, tmp_path):
+        path = tmp_path / "code.py"
+        path.write_text("x = 1\n")
+        read_text_cached(path)
+        read_text_cached(str(path))
+        info = _read_text.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_modified_file_is_reread(self, tmp_path):
+        path = tmp_path / "code.py"
+        path.write_text("x = 1\n")
+        assert read_text_cached(path) == "x = 1\n"
+        path.write_text("x = 22\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert read_text_cached(path) == "x = 22\n"
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_text_cached(tmp_path / "missing.py")
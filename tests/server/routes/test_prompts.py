@@ -59,31 +59,21 @@ def mock_token_metrics():
 
 
 @pytest.fixture
-def prompts_test_env():
+def prompts_test_env(monkeypatch):
     """
     Fixture that sets up mocks inside fixtures (not at module level) to avoid
-    collection-time pollution. Uses sys.modules patching for dynamic imports.
+    collection-time pollution. Uses sys.modules patching for dynamic imports;
+    monkeypatch restores the original entries after the test.
     """
-    # Store original modules - include all modules that might be affected
-    original_modules = {}
-    modules_to_mock = [
-        "pdd.server.security",
-        "pdd.server.token_counter",
-        "pdd.preprocess",
-        "pdd.sync_determine_operation",
-        "pdd.llm_invoke",
-    ]
-    # Also track modules that get imported during test and need cleanup
-    modules_to_clear = [
-        "pdd.server.routes.prompts",
+    # Modules whose top-level imports could capture the mocked symbols below
+    polluted_modules = (
         "pdd.server",
+        "pdd.server.app",
         "pdd.server.routes",
-    ]
-
-    # Save all original module states
-    for mod in modules_to_mock + modules_to_clear:
-        if mod in sys.modules:
-            original_modules[mod] = sys.modules[mod]
+        "pdd.server.routes.prompts",
+        "pdd.server.routes.files",
+    )
+    originally_loaded = {mod for mod in polluted_modules if mod in sys.modules}
 
     # Create mocks
     mock_security = types.ModuleType("pdd.server.security")
@@ -94,28 +84,26 @@ def prompts_test_env():
     mock_security.create_token_dependency = MagicMock()
     mock_security.SecurityLoggingMiddleware = MagicMock()
     mock_security.DEFAULT_BLACKLIST = []
-    sys.modules["pdd.server.security"] = mock_security
+    monkeypatch.setitem(sys.modules, "pdd.server.security", mock_security)
 
     mock_token_counter = types.ModuleType("pdd.server.token_counter")
     mock_token_counter.get_token_metrics = MagicMock()
     mock_token_counter.get_context_limit = MagicMock(return_value=128000)
-    sys.modules["pdd.server.token_counter"] = mock_token_counter
+    monkeypatch.setitem(sys.modules, "pdd.server.token_counter", mock_token_counter)
 
     mock_preprocess = types.ModuleType("pdd.preprocess")
     mock_preprocess.preprocess = MagicMock()
-    sys.modules["pdd.preprocess"] = mock_preprocess
+    monkeypatch.setitem(sys.modules, "pdd.preprocess", mock_preprocess)
 
-    # Clear cached imports of the module under test
-    for mod_name in list(sys.modules.keys()):
-        if "pdd.server.routes.prompts" in mod_name:
-            del sys.modules[mod_name]
+    # Clear the cached import of the module under test
+    monkeypatch.delitem(sys.modules, "pdd.server.routes.prompts", raising=False)
 
     # Mock sync_determine_operation
     mock_sync_op = types.ModuleType("pdd.sync_determine_operation")
     mock_sync_op.read_fingerprint = MagicMock()
     mock_sync_op.get_pdd_file_paths = MagicMock()
     mock_sync_op.calculate_sha256 = MagicMock()
-    sys.modules["pdd.sync_determine_operation"] = mock_sync_op
+    monkeypatch.setitem(sys.modules, "pdd.sync_determine_operation", mock_sync_op)
 
     # Mock llm_invoke module
     mock_llm_invoke = types.ModuleType("pdd.llm_invoke")
@@ -123,7 +111,7 @@ def prompts_test_env():
     mock_llm_invoke._load_model_data = MagicMock()
     mock_llm_invoke.LLM_MODEL_CSV_PATH = "/mock/llm_model.csv"
     mock_llm_invoke.DEFAULT_BASE_MODEL = "claude-sonnet-4-20250514"
-    sys.modules["pdd.llm_invoke"] = mock_llm_invoke
+    monkeypatch.setitem(sys.modules, "pdd.llm_invoke", mock_llm_invoke)
 
     # Import code under test
     from pdd.server.routes.prompts import (
@@ -193,39 +181,19 @@ def prompts_test_env():
         'mock_llm_invoke': mock_llm_invoke,
     }
 
-    # Cleanup: delete all modules we mocked or imported during test
-    for mod in modules_to_mock:
-        if mod in sys.modules:
-            del sys.modules[mod]
-
-    # Clear any prompts module that was imported with mocks
-    for mod_name in list(sys.modules.keys()):
-        if "pdd.server.routes.prompts" in mod_name:
-            del sys.modules[mod_name]
-
-    # Restore all original modules
-    for mod, original in original_modules.items():
-        sys.modules[mod] = original
-
     # Purge modules whose top-level imports could have captured MagicMock
     # references to the patched pdd.server.security / token_counter symbols
     # (PathValidator, SecurityLoggingMiddleware, get_token_metrics, ...).
     # These get loaded transitively via pdd/server/__init__.py and would
     # otherwise survive the fixture and break later tests (e.g. starlette
-    # awaiting a MagicMock middleware in TestClient). Only purge if we
-    # didn't have a real version saved to restore; do NOT purge clean
-    # sibling modules like pdd.server.executor whose function objects are
-    # already bound by name in other test files' module globals.
-    polluted_modules = (
-        "pdd.server",
-        "pdd.server.app",
-        "pdd.server.routes",
-        "pdd.server.routes.prompts",
-        "pdd.server.routes.files",
-    )
+    # awaiting a MagicMock middleware in TestClient). Only purge modules that
+    # were not loaded before the fixture; monkeypatch puts back the original
+    # pdd.server.routes.prompts. Do NOT purge clean sibling modules like
+    # pdd.server.executor whose function objects are already bound by name in
+    # other test files' module globals.
     for mod_name in polluted_modules:
-        if mod_name in sys.modules and mod_name not in original_modules:
-            del sys.modules[mod_name]
+        if mod_name not in originally_loaded:
+            sys.modules.pop(mod_name, None)
 
 
 @pytest.fixture
@@ -33,7 +33,7 @@ PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "agentic_bug_step9_gene
 # --- Fixtures ---
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def step7_prompt_content() -> str:
     """Load the Step 7 prompt content."""
     assert PROMPT_PATH.exists(), f"Prompt file not found: {PROMPT_PATH}"
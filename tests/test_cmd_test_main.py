@@ -1,8 +1,11 @@
 """
 Tests for the `cmd_test_main` function, which handles CLI commands for test generation.
 """
+import gzip
+import io
 import json
 import os
+from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 import pytest
 import click
@@ -93,7 +96,8 @@ def test_cmd_test_main_coverage_handling(
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
          patch("pdd.cmd_test_main.increase_tests") as mock_increase_tests, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         # Mock construct_paths to return some test data
         mock_construct_paths.return_value = (
@@ -256,7 +260,7 @@ def test_cmd_test_main_successful_generate_test_no_coverage(mock_ctx_fixture, mo
     """
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()) as m_file:
+         patch("pdd.cmd_test_main._write_output") as m_write:
 
         mock_construct_paths.return_value = (
             {},  # resolved_config
@@ -279,9 +283,9 @@ def test_cmd_test_main_successful_generate_test_no_coverage(mock_ctx_fixture, mo
         )
 
         # Verify file writing
-        m_file.assert_called_once_with(mock_files_fixture["output"], "w", encoding="utf-8")
-        handle = m_file()
-        handle.write.assert_called_once_with("unit_test_code")
+        m_write.assert_called_once_with(
+            Path(mock_files_fixture["output"]), b"unit_test_code", append=False
+        )
 
         # Verify the result (4th element is agentic_success, None for Python)
         assert result == ("unit_test_code", 0.10, "model_v1", None, "")
@@ -294,7 +298,7 @@ def test_cmd_test_main_successful_increase_test_with_coverage(mock_ctx_fixture,
     """
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.increase_tests") as mock_increase_tests, \
-         patch("builtins.open", mock_open()) as m_file:
+         patch("pdd.cmd_test_main._write_output") as m_write:
 
         mock_construct_paths.return_value = (
             {},  # resolved_config
@@ -322,9 +326,9 @@ def test_cmd_test_main_successful_increase_test_with_coverage(mock_ctx_fixture,
         )
 
         # Verify file writing and result
-        m_file.assert_any_call(mock_files_fixture["output"], "w", encoding="utf-8")
-        handle = m_file()
-        handle.write.assert_called_once_with("more_tests")
+        m_write.assert_called_once_with(
+            Path(mock_files_fixture["output"]), b"more_tests", append=False
+        )
         # 4th element is agentic_success, None for Python
         assert result == ("more_tests", 0.20, "model_v2", None, "")
 
@@ -337,7 +341,7 @@ def test_cmd_test_main_merge_existing_tests(mock_ctx_fixture, mock_files_fixture
     """
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()) as m_file:
+         patch("pdd.cmd_test_main._write_output") as m_write:
 
         # Ensure 'existing_tests' is in the output path from construct_paths
         mock_construct_paths.return_value = (
@@ -360,11 +364,11 @@ def test_cmd_test_main_merge_existing_tests(mock_ctx_fixture, mock_files_fixture
             merge=True,
         )
 
-        # When merge=True, file should be opened in APPEND mode, not write mode
-        m_file.assert_any_call(mock_files_fixture["existing_tests"][0], "a", encoding="utf-8")
-        handle = m_file()
-        # Content is prepended with newlines when appending
-        handle.write.assert_called_once_with("\n\n" + "merged_code")
+        # When merge=True, file should be opened in APPEND mode, not write mode.
+        # Content is prepended with newlines when appending.
+        m_write.assert_called_once_with(
+            Path(mock_files_fixture["existing_tests"][0]), b"\n\n", b"merged_code", append=True
+        )
 
 
 def test_cmd_test_main_output_directory_path_uses_resolved_file(mock_ctx_fixture, mock_files_fixture, tmp_path):
@@ -377,7 +381,7 @@ def test_cmd_test_main_output_directory_path_uses_resolved_file(mock_ctx_fixture
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()) as m_open:
+         patch("pdd.cmd_test_main._write_output") as m_write:
 
         resolved_file = out_dir / "unit_test_file.py"
         mock_construct_paths.return_value = (
@@ -403,9 +407,7 @@ def test_cmd_test_main_output_directory_path_uses_resolved_file(mock_ctx_fixture
 
         # 4th element is agentic_success, None for Python
         assert result == ("unit_test_code", 0.10, "model_v1", None, "")
-        m_open.assert_called_once_with(str(resolved_file), "w", encoding="utf-8")
-        handle = m_open()
-        handle.write.assert_called_once_with("unit_test_code")
+        m_write.assert_called_once_with(resolved_file, b"unit_test_code", append=False)
 
 
 def test_cmd_test_main_non_python_agentic_writes_content_to_output_path(mock_ctx_fixture, mock_files_fixture, tmp_path):
@@ -845,7 +847,8 @@ def test_cmd_test_main_pdd_repair_directive_reaches_native_generate(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
         mock_construct_paths.return_value = (
             {},
             {"prompt_file": "original prompt body", "code_file": "code"},
@@ -885,7 +888,8 @@ def test_cmd_test_main_pdd_repair_directive_absent_when_kwarg_unset(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
         mock_construct_paths.return_value = (
             {},
             {"prompt_file": "original prompt body", "code_file": "code"},
@@ -921,7 +925,8 @@ def test_cmd_test_main_ignores_stale_env_directive_without_kwarg(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
         mock_construct_paths.return_value = (
             {},
             {"prompt_file": "original prompt body", "code_file": "code"},
@@ -992,7 +997,8 @@ def test_cmd_test_main_uses_pddrc_strength_from_resolved_config():
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         # resolved_config contains pddrc strength value
         mock_construct_paths.return_value = (
@@ -1043,7 +1049,8 @@ def test_cmd_test_main_cli_strength_overrides_pddrc():
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         # resolved_config would normally have pddrc value, but CLI should win
         # However, construct_paths merges CLI > pddrc, so resolved_config
@@ -1146,6 +1153,29 @@ def test_cmd_test_main_multiple_existing_tests_concatenated(tmp_path):
 # Cloud Support Tests
 # -----------------------------------------------------------------------------
 
+def _posted_payload(call):
+    """Return the JSON payload of a mocked POST, whether sent as json= or data=."""
+    kwargs = call[1]
+    if "json" in kwargs:
+        return kwargs["json"]
+    assert kwargs["headers"]["Content-Type"] == "application/json"
+    body = kwargs["data"]
+    if kwargs["headers"].get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+@pytest.fixture(autouse=True)
+def reset_cloud_breaker(monkeypatch):
+    """Start each test with a closed circuit breaker and no retry sleeps."""
+    from pdd.cmd_test_main import _CLOUD_BREAKER
+
+    monkeypatch.setattr("pdd.core.cloud_retry.backoff_delay", lambda *a, **k: 0)
+    _CLOUD_BREAKER.reset()
+    yield
+    _CLOUD_BREAKER.reset()
+
+
 @pytest.fixture
 def mock_cloud_ctx():
     """Create a mock Click context configured for cloud execution."""
@@ -1170,7 +1200,7 @@ def mock_get_jwt_token_fixture(monkeypatch):
 
 @pytest.fixture
 def mock_requests_post_fixture(monkeypatch):
-    """Mock requests.post for cloud API calls."""
+    """Mock the pooled session POST used for cloud API calls."""
     mock = MagicMock()
     mock_response = MagicMock(spec=requests.Response)
     mock_response.json.return_value = {
@@ -1181,7 +1211,7 @@ def mock_requests_post_fixture(monkeypatch):
     mock_response.status_code = 200
     mock_response.raise_for_status = MagicMock()
     mock.return_value = mock_response
-    monkeypatch.setattr("pdd.cmd_test_main.requests.post", mock)
+    monkeypatch.setattr("pdd.cmd_test_main._SESSION.post", mock)
     return mock
 
 
@@ -1209,7 +1239,8 @@ def test_cmd_test_main_cloud_success_generate_mode(
 ):
     """Test successful cloud test generation in 'generate' mode."""
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},  # resolved_config
@@ -1239,13 +1270,25 @@ def test_cmd_test_main_cloud_success_generate_mode(
         mock_requests_post_fixture.assert_called_once()
         call_kwargs = mock_requests_post_fixture.call_args
         assert call_kwargs[0][0] == CLOUD_GENERATE_TEST_URL
-        payload = call_kwargs[1]["json"]
+        payload = _posted_payload(call_kwargs)
         assert payload["mode"] == "generate"
         assert payload["promptContent"] == "Cloud test prompt"
         assert payload["codeContent"] == "def func(): pass"
         assert payload["language"] == "python"
 
 
+def test_cloud_session_uses_pooled_https_adapter():
+    """The module-level session pools HTTPS connections across cloud calls."""
+    from pdd.cmd_test_main import _SESSION
+
+    adapter = _SESSION.get_adapter(CLOUD_GENERATE_TEST_URL)
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 2
+    # HTTP status retries belong to ``retry`` alone.
+    assert not adapter.max_retries.status_forcelist
+
+
 def test_cmd_test_main_cloud_success_increase_mode(
     mock_cloud_ctx, mock_get_jwt_token_fixture, mock_requests_post_fixture,
     mock_rich_console_fixture, mock_cloud_env_vars
@@ -1262,7 +1305,8 @@ def test_cmd_test_main_cloud_success_increase_mode(
     mock_requests_post_fixture.return_value = mock_response
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
-         patch("builtins.open", mock_open(read_data="existing test content")):
+         patch("builtins.open", mock_open(read_data="existing test content")), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1293,7 +1337,7 @@ def test_cmd_test_main_cloud_success_increase_mode(
 
         # Verify cloud request had increase mode fields
         call_kwargs = mock_requests_post_fixture.call_args
-        payload = call_kwargs[1]["json"]
+        payload = _posted_payload(call_kwargs)
         assert payload["mode"] == "increase"
         assert "existingTests" in payload
         assert "coverageReport" in payload
@@ -1308,7 +1352,8 @@ def test_cmd_test_main_cloud_fallback_auth_failure(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1348,7 +1393,8 @@ def test_cmd_test_main_cloud_fallback_timeout(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1376,6 +1422,129 @@ def test_cmd_test_main_cloud_fallback_timeout(
                    for call_args in mock_rich_console_fixture.call_args_list if call_args[0])
 
 
+def test_cmd_test_main_cloud_retries_transient_timeout(
+    mock_cloud_ctx, mock_get_jwt_token_fixture, mock_requests_post_fixture,
+    mock_rich_console_fixture, mock_cloud_env_vars
+):
+    """A single timeout is retried instead of falling back to local."""
+    success = mock_requests_post_fixture.return_value
+    mock_requests_post_fixture.side_effect = [
+        requests.exceptions.Timeout("Request timed out"),
+        success,
+    ]
+
+    with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
+         patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
+         patch("pdd.cmd_test_main._write_output"):
+
+        mock_construct_paths.return_value = (
+            {},
+            {"prompt_file": "test prompt", "code_file": "def func(): pass"},
+            {"output": "test_output.py"},
+            "python"
+        )
+
+        result = cmd_test_main(
+            ctx=mock_cloud_ctx,
+            prompt_file="test.prompt",
+            code_file="test.py",
+            output="test_output.py",
+            language=None,
+            coverage_report=None,
+            existing_tests=None,
+            target_coverage=None,
+            merge=False,
+        )
+
+        assert mock_requests_post_fixture.call_count == 2
+        mock_local_generate.assert_not_called()
+        assert result[0] == DEFAULT_MOCK_GENERATED_TEST
+
+
+def test_cmd_test_main_cloud_closes_failed_response_before_retry(
+    mock_cloud_ctx, mock_get_jwt_token_fixture, mock_requests_post_fixture,
+    mock_rich_console_fixture, mock_cloud_env_vars
+):
+    """A streamed 503 response is closed before the POST is retried."""
+    unavailable = MagicMock(spec=requests.Response)
+    unavailable.status_code = 503
+    unavailable.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        response=unavailable
+    )
+    success = mock_requests_post_fixture.return_value
+    mock_requests_post_fixture.side_effect = [unavailable, success]
+
+    with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
+         patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
+         patch("pdd.cmd_test_main._write_output"):
+
+        mock_construct_paths.return_value = (
+            {},
+            {"prompt_file": "test prompt", "code_file": "def func(): pass"},
+            {"output": "test_output.py"},
+            "python"
+        )
+
+        result = cmd_test_main(
+            ctx=mock_cloud_ctx,
+            prompt_file="test.prompt",
+            code_file="test.py",
+            output="test_output.py",
+            language=None,
+            coverage_report=None,
+            existing_tests=None,
+            target_coverage=None,
+            merge=False,
+        )
+
+        unavailable.close.assert_called_once()
+        assert mock_requests_post_fixture.call_count == 2
+        mock_local_generate.assert_not_called()
+        assert result[0] == DEFAULT_MOCK_GENERATED_TEST
+
+
+def test_cmd_test_main_cloud_open_breaker_skips_request(
+    mock_cloud_ctx, mock_get_jwt_token_fixture, mock_requests_post_fixture,
+    mock_rich_console_fixture, mock_cloud_env_vars
+):
+    """Once the circuit breaker is open, the cloud is not called at all."""
+    from pdd.cmd_test_main import _CLOUD_BREAKER
+
+    mock_requests_post_fixture.side_effect = requests.exceptions.ConnectionError("down")
+    for _ in range(_CLOUD_BREAKER.failure_threshold):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            _CLOUD_BREAKER.execute(mock_requests_post_fixture)
+    mock_requests_post_fixture.reset_mock()
+
+    with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
+         patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
+         patch("pdd.cmd_test_main._write_output"):
+
+        mock_construct_paths.return_value = (
+            {},
+            {"prompt_file": "test prompt", "code_file": "def func(): pass"},
+            {"output": "test_output.py"},
+            "python"
+        )
+        mock_local_generate.return_value = ("local_test_code", 0.05, "local_model")
+
+        result = cmd_test_main(
+            ctx=mock_cloud_ctx,
+            prompt_file="test.prompt",
+            code_file="test.py",
+            output="test_output.py",
+            language=None,
+            coverage_report=None,
+            existing_tests=None,
+            target_coverage=None,
+            merge=False,
+        )
+
+        mock_requests_post_fixture.assert_not_called()
+        mock_local_generate.assert_called_once()
+        assert result[0] == "local_test_code"
+
+
 def test_cmd_test_main_cloud_fallback_5xx_error(
     mock_cloud_ctx, mock_get_jwt_token_fixture, mock_requests_post_fixture,
     mock_rich_console_fixture, mock_cloud_env_vars
@@ -1390,7 +1559,8 @@ def test_cmd_test_main_cloud_fallback_5xx_error(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1430,7 +1600,8 @@ def test_cmd_test_main_cloud_fallback_json_decode_error(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1472,7 +1643,8 @@ def test_cmd_test_main_cloud_fallback_no_test_returned(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1522,7 +1694,8 @@ def test_cmd_test_main_cloud_non_recoverable_http_errors(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1562,7 +1735,8 @@ def test_cmd_test_main_cloud_insufficient_credits_displays_balance(
     mock_requests_post_fixture.side_effect = http_error
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1602,7 +1776,8 @@ def test_cmd_test_main_cloud_only_mode_prevents_fallback(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1637,7 +1812,8 @@ def test_cmd_test_main_local_mode_skips_cloud(
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_local_generate, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},
@@ -1675,7 +1851,8 @@ def test_cmd_test_main_cloud_payload_contains_all_params(
     mock_cloud_ctx.obj['verbose'] = True
 
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {"strength": 0.8, "temperature": 0.5, "time": 0.3},  # resolved_config
@@ -1699,7 +1876,7 @@ def test_cmd_test_main_cloud_payload_contains_all_params(
         )
 
         call_kwargs = mock_requests_post_fixture.call_args
-        payload = call_kwargs[1]["json"]
+        payload = _posted_payload(call_kwargs)
 
         # Verify all expected fields are present
         assert "promptContent" in payload
@@ -1855,7 +2032,8 @@ def test_cmd_test_main_example_file_detection(mock_ctx_fixture, mock_files_fixtu
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
          patch("pdd.cmd_test_main.resolve_effective_config") as mock_resolve_config, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         # Mock construct_paths to return test data
         mock_construct_paths.return_value = (
@@ -1914,7 +2092,8 @@ def test_cmd_test_main_non_example_file_uses_code(mock_ctx_fixture, mock_files_f
     with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
          patch("pdd.cmd_test_main.generate_test") as mock_generate_test, \
          patch("pdd.cmd_test_main.resolve_effective_config") as mock_resolve_config, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         # Mock construct_paths to return test data
         mock_construct_paths.return_value = (
@@ -1964,13 +2143,14 @@ def test_cmd_test_main_non_example_file_uses_code(mock_ctx_fixture, mock_files_f
 
 
 # pylint: disable=redefined-outer-name
-def test_agentic_python_test_gets_sys_path_preamble(mock_ctx_fixture, mock_files_fixture):
+def test_agentic_python_test_gets_sys_path_preamble(mock_ctx_fixture, mock_files_fixture, tmp_path):
     """
     When agentic_mode=True and language is Python, the returned test content
     should have _inject_sys_path_preamble applied so that pytest --cov can
     find the module under test.
     """
     mock_ctx_fixture.obj["agentic_mode"] = True
+    output_file = tmp_path / mock_files_fixture["output"]
 
     raw_agent_output = (
         "import pytest\n"
@@ -1985,7 +2165,7 @@ def test_agentic_python_test_gets_sys_path_preamble(mock_ctx_fixture, mock_files
         mock_construct_paths.return_value = (
             {},  # resolved_config
             {"prompt_file": "prompt_contents", "code_file": "code_contents"},
-            {"output": mock_files_fixture["output"]},
+            {"output": str(output_file)},
             "python"
         )
         mock_agentic.return_value = (raw_agent_output, 0.05, "agent_model", True, "")
@@ -1994,7 +2174,7 @@ def test_agentic_python_test_gets_sys_path_preamble(mock_ctx_fixture, mock_files
             ctx=mock_ctx_fixture,
             prompt_file=mock_files_fixture["prompt_file"],
             code_file=mock_files_fixture["code_file"],
-            output=mock_files_fixture["output"],
+            output=str(output_file),
             language=None,
             coverage_report=None,
             existing_tests=None,
@@ -2036,7 +2216,8 @@ def test_python_agentic_merge_uses_native_path(mock_ctx_fixture, mock_files_fixt
          }), \
          patch("pdd.cmd_test_main.generate_test", return_value=(
              "def test_new(): assert True", 0.05, "model"
-         )) as mock_generate:
+         )) as mock_generate, \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_construct_paths.return_value = (
             {},  # resolved_config
@@ -2090,7 +2271,8 @@ def test_issue_717_manual_skips_agentic_for_non_python(
     with patch("pdd.cmd_test_main.construct_paths") as mock_cp, \
          patch("pdd.cmd_test_main.generate_test") as mock_gen, \
          patch("pdd.agentic_test_generate.run_agentic_test_generate") as mock_agentic, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_cp.return_value = (
             {},
@@ -2127,7 +2309,8 @@ def test_issue_717_manual_overrides_agentic_mode(mock_ctx_fixture):
     with patch("pdd.cmd_test_main.construct_paths") as mock_cp, \
          patch("pdd.cmd_test_main.generate_test") as mock_gen, \
          patch("pdd.agentic_test_generate.run_agentic_test_generate") as mock_agentic, \
-         patch("builtins.open", mock_open()):
+         patch("builtins.open", mock_open()), \
+         patch("pdd.cmd_test_main._write_output"):
 
         mock_cp.return_value = (
             {},
@@ -2199,28 +2382,30 @@ def test_issue_717_cli_integration_manual_kwarg_forwarded():
         mock_cmd_test.return_value = ("test code", 0.05, "model", None)
 
         runner = CliRunner()
-        result = runner.invoke(
-            test_cmd,
-            [
-                "--manual",
-                "prompts/deploy_Shell.prompt",
-                "src/deploy.sh",
-                "--output", "tests/test_deploy.sh",
-            ],
-            obj={
-                "verbose": False,
-                "strength": 0.5,
-                "temperature": 0.0,
-                "force": False,
-                "quiet": False,
-                "local": True,
-                "agentic_mode": False,
-                "context": None,
-                "confirm_callback": None,
-                "time": 0.25,
-            },
-            catch_exceptions=False,
-        )
+        # Run in a scratch cwd so the command leaves no .pdd/meta files behind.
+        with runner.isolated_filesystem():
+            result = runner.invoke(
+                test_cmd,
+                [
+                    "--manual",
+                    "prompts/deploy_Shell.prompt",
+                    "src/deploy.sh",
+                    "--output", "tests/test_deploy.sh",
+                ],
+                obj={
+                    "verbose": False,
+                    "strength": 0.5,
+                    "temperature": 0.0,
+                    "force": False,
+                    "quiet": False,
+                    "local": True,
+                    "agentic_mode": False,
+                    "context": None,
+                    "confirm_callback": None,
+                    "time": 0.25,
+                },
+                catch_exceptions=False,
+            )
 
         assert result.exit_code == 0, f"CLI exited with code {result.exit_code}: {result.output}"
         mock_cmd_test.assert_called_once()
@@ -2280,3 +2465,211 @@ def test_cmd_test_main_propagates_error_from_agentic_failure(mock_ctx_fixture, m
     assert error_msg in result[4], (
         f"Expected error message propagated through cmd_test_main, got: {result[4]!r}"
     )
+
+
+# --- Existing test file reading ---
+
+
+def test_read_existing_tests_joins_small_and_mmapped_files(tmp_path):
+    """Small files are read and large files mmapped; both join with newlines."""
+    from pdd.cmd_test_main import _MMAP_MIN_BYTES, _read_existing_tests
+
+    small = tmp_path / "test_small.py"
+    small.write_text("def test_small():\r\n    assert True\r\n", encoding="utf-8")
+    large_body = "# pad\n" * (_MMAP_MIN_BYTES // 6 + 1)
+    large = tmp_path / "test_large.py"
+    large.write_text(large_body, encoding="utf-8")
+
+    result = _read_existing_tests([str(small), str(tmp_path / "missing.py"), str(large)])
+
+    assert result == "def test_small():\n    assert True\n" + "\n" + large_body
+
+
+def test_read_existing_tests_skips_undecodable_file(tmp_path, mock_rich_console_fixture):
+    """A non-UTF-8 file is reported and skipped without dropping the others."""
+    from pdd.cmd_test_main import _read_existing_tests
+
+    good = tmp_path / "test_good.py"
+    good.write_text("def test_good(): pass", encoding="utf-8")
+    bad = tmp_path / "test_bad.py"
+    bad.write_bytes(b"\xff\xfe\xfa")
+
+    assert _read_existing_tests([str(bad), str(good)]) == "def test_good(): pass"
+    assert _read_existing_tests([str(bad)]) is None
+    assert any("test_bad.py" in str(c[0][0]) for c in mock_rich_console_fixture.call_args_list)
+
+
+# --- Output writing ---
+
+
+def test_write_output_truncates_then_appends(tmp_path):
+    """Write mode replaces the file; append mode adds to its end."""
+    from pdd.cmd_test_main import _write_output
+
+    target = tmp_path / "test_out.py"
+    target.write_text("stale content that is longer than the new body\n", encoding="utf-8")
+
+    _write_output(target, "def test_a(): pass\n".encode("utf-8"))
+    assert target.read_text(encoding="utf-8") == "def test_a(): pass\n"
+
+    _write_output(target, b"\n\n", b"def test_b(): pass\n", append=True)
+    assert target.read_text(encoding="utf-8") == "def test_a(): pass\n\n\ndef test_b(): pass\n"
+
+
+# --- Cloud response parsing ---
+
+
+def test_parse_cloud_response_streams_result_fields():
+    """With ijson available, result fields are parsed from the raw stream."""
+    pytest.importorskip("ijson")
+    from pdd.cmd_test_main import _parse_cloud_response
+
+    body = json.dumps({
+        "generatedTest": DEFAULT_MOCK_GENERATED_TEST,
+        "totalCost": 0.5,
+        "modelName": "cloud-model",
+        "debug": {"ignored": True},
+    }).encode("utf-8")
+    response = MagicMock(spec=requests.Response)
+    response.raw = io.BytesIO(body)
+
+    data = _parse_cloud_response(response)
+
+    response.json.assert_not_called()
+    assert data["generatedTest"] == DEFAULT_MOCK_GENERATED_TEST
+    assert float(data["totalCost"]) == 0.5
+    assert data["modelName"] == "cloud-model"
+    assert "debug" not in data
+    # The unparsed tail is drained so the pooled connection can be reused.
+    assert response.raw.read() == b""
+    response.close.assert_called_once()
+
+
+def test_parse_cloud_response_invalid_stream_raises_json_error():
+    """Malformed streamed JSON surfaces as json.JSONDecodeError."""
+    pytest.importorskip("ijson")
+    from pdd.cmd_test_main import _parse_cloud_response
+
+    response = MagicMock(spec=requests.Response)
+    response.raw = io.BytesIO(b'{"generatedTest": "def test_')
+
+    with pytest.raises(json.JSONDecodeError):
+        _parse_cloud_response(response)
+    response.close.assert_called_once()
+
+
+def test_parse_cloud_response_falls_back_to_json_without_raw_stream():
+    """A response without a raw byte stream is parsed with response.json()."""
+    from pdd.cmd_test_main import _parse_cloud_response
+
+    response = MagicMock(spec=requests.Response)
+    response.json.return_value = {"generatedTest": "x", "totalCost": 0.1, "modelName": "m"}
+
+    assert _parse_cloud_response(response) == response.json.return_value
+
+
+@pytest.mark.parametrize("filename,expected", [
+    ("module_example.py", "example"),
+    ("module_example.js", "example"),
+    ("module_example.java", "example"),
+    ("module_example.ts", "example"),
+    ("module.py", "code"),
+    ("test_EXAMPLE.py", "code"),
+    ("module_Example.py", "code"),
+    ("example.py", "code"),
+])
+def test_classify_test_file(filename, expected):
+    """Only a case-sensitive ``_example`` stem suffix selects example mode."""
+    from pdd.cmd_test_main import _classify_test_file
+
+    assert _classify_test_file(Path("src") / filename) == expected
+
+
+def test_encode_cloud_payload_round_trips():
+    """The encoded request body decodes back to the original payload."""
+    from pdd.cmd_test_main import _encode_cloud_payload
+
+    payload = {"promptContent": "caf\u00e9 \"quoted\"\n", "strength": 0.5, "codeContent": None}
+    body_kwargs, headers = _encode_cloud_payload(payload)
+
+    if "data" in body_kwargs:
+        assert headers == {"Content-Type": "application/json"}
+        assert json.loads(body_kwargs["data"]) == payload
+    else:
+        assert body_kwargs == {"json": payload}
+        assert headers == {}
+
+
+def test_encode_cloud_payload_gzips_large_bodies():
+    """Bodies over the threshold are gzip-compressed when compression is allowed."""
+    from pdd.cmd_test_main import _GZIP_MIN_BYTES, _encode_cloud_payload
+
+    small = {"promptContent": "x"}
+    large = {"promptContent": "def test_x():\n    pass\n" * (_GZIP_MIN_BYTES // 10)}
+
+    small_kwargs, small_headers = _encode_cloud_payload(small, compress=True)
+    assert "Content-Encoding" not in small_headers
+
+    body_kwargs, headers = _encode_cloud_payload(large, compress=True)
+    assert headers["Content-Encoding"] == "gzip"
+    assert len(body_kwargs["data"]) < _GZIP_MIN_BYTES
+    assert json.loads(gzip.decompress(body_kwargs["data"])) == large
+
+
+def test_cmd_test_main_cloud_retries_uncompressed_on_415(
+    mock_cloud_ctx, mock_get_jwt_token_fixture, mock_requests_post_fixture,
+    mock_rich_console_fixture, mock_cloud_env_vars, monkeypatch
+):
+    """A 415 to a gzip body disables compression and resends the plain body."""
+    monkeypatch.setattr(CloudConfig, "SUPPORTS_GZIP", True)
+    unsupported = MagicMock(spec=requests.Response)
+    unsupported.status_code = 415
+    mock_requests_post_fixture.side_effect = [unsupported, mock_requests_post_fixture.return_value]
+
+    with patch("pdd.cmd_test_main.construct_paths") as mock_construct_paths, \
+         patch("pdd.cmd_test_main._write_output"):
+        mock_construct_paths.return_value = (
+            {},
+            {"prompt_file": "p" * 20000, "code_file": "def func(): pass"},
+            {"output": "test_output.py"},
+            "python"
+        )
+
+        result = cmd_test_main(
+            ctx=mock_cloud_ctx,
+            prompt_file="test.prompt",
+            code_file="test.py",
+            output="test_output.py",
+            language=None,
+            coverage_report=None,
+            existing_tests=None,
+            target_coverage=None,
+            merge=False,
+        )
+
+    first, second = mock_requests_post_fixture.call_args_list
+    assert first[1]["headers"]["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in second[1]["headers"]
+    assert _posted_payload(second)["promptContent"] == "p" * 20000
+    assert CloudConfig.SUPPORTS_GZIP is False
+    assert result[0] == DEFAULT_MOCK_GENERATED_TEST
+
+
+def test_write_output_creates_missing_parent_dirs(tmp_path):
+    """The output directory is created on demand when it does not exist yet."""
+    from pdd.cmd_test_main import _write_output
+
+    target = tmp_path / "nested" / "tests" / "test_out.py"
+    _write_output(target, b"def test_a(): pass\n")
+
+    assert target.read_bytes() == b"def test_a(): pass\n"
+
+
+def test_info_prints_plain_text_when_not_a_terminal(capsys, mock_rich_console_fixture):
+    """Status lines bypass Rich rendering when output is piped."""
+    from pdd.cmd_test_main import _info
+
+    _info("Successfully wrote tests to out/[x]_test.py", style="green")
+
+    assert capsys.readouterr().out == "Successfully wrote tests to out/[x]_test.py\n"
+    mock_rich_console_fixture.assert_not_called()
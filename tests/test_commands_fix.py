@@ -337,6 +337,8 @@ def test_cli_fix_multiple_test_files(tmp_path):
             temperature=None,
             protect_tests=False,
             failure_aware_retries=True,
+            prompt_content="prompt content",
+            code_content="code content",
         )
         mock_fix_main.assert_any_call(
             ctx=ANY,
@@ -357,8 +359,171 @@ def test_cli_fix_multiple_test_files(tmp_path):
             temperature=None,
             protect_tests=False,
             failure_aware_retries=True,
+            prompt_content="prompt content",
+            code_content="code content",
         )
 
+def test_cli_fix_batch_uses_single_batched_call(tmp_path):
+    """--batch routes multiple test files through one fix_main_batch call."""
+    runner = CliRunner()
+
+    prompt_file = tmp_path / "prompt.prompt"
+    prompt_file.write_text("prompt content")
+    code_file = tmp_path / "code.py"
+    code_file.write_text("code content")
+    test_files = [tmp_path / "test_1.py", tmp_path / "test_2.py"]
+    for tf in test_files:
+        tf.write_text("test content")
+    error_file = tmp_path / "error.txt"
+    error_file.write_text("error content")
+
+    batch_results = {str(tf): (True, str(tf)) for tf in test_files}
+    with patch('pdd.fix_main.fix_main') as mock_fix_main, \
+         patch('pdd.fix_main.fix_main_batch') as mock_fix_main_batch:
+        mock_fix_main_batch.return_value = (batch_results, "fixed_code", 1, 0.1, "gpt-4")
+        result = runner.invoke(cli.cli, [
+            '--local', 'fix', '--manual', '--batch',
+            str(prompt_file), str(code_file), *[str(tf) for tf in test_files], str(error_file),
+        ])
+
+        assert result.exit_code == 0, result.output
+        mock_fix_main.assert_not_called()
+        mock_fix_main_batch.assert_called_once()
+        kwargs = mock_fix_main_batch.call_args.kwargs
+        assert kwargs["unit_test_files"] == [str(tf) for tf in test_files]
+        assert kwargs["error_file"] == str(error_file)
+
+
+@pytest.mark.parametrize("global_args,fix_args,message", [
+    ([], [], "--batch runs locally only"),
+    (['--local'], ['--loop'], "--batch cannot be combined with --loop"),
+    (['--local'], ['--auto-submit'], "--batch cannot be combined with --auto-submit"),
+])
+def test_cli_fix_batch_rejects_unsupported_modes(tmp_path, global_args, fix_args, message):
+    """--batch has no cloud, loop or auto-submit path, so those combinations are rejected."""
+    runner = CliRunner()
+    files = [tmp_path / name for name in ("p.prompt", "code.py", "test_1.py", "test_2.py", "error.txt")]
+    for f in files:
+        f.write_text("content")
+
+    with patch('pdd.fix_main.fix_main') as mock_fix_main, \
+         patch('pdd.fix_main.fix_main_batch') as mock_fix_main_batch:
+        result = runner.invoke(cli.cli, [
+            *global_args, 'fix', '--manual', '--batch', *fix_args, *[str(f) for f in files],
+        ])
+
+    assert message in result.output
+    mock_fix_main.assert_not_called()
+    mock_fix_main_batch.assert_not_called()
+
+
+def test_cli_fix_batch_rejects_single_output_test_file(tmp_path):
+    """--batch writes one file per test, so a single --output-test file is rejected, not unbatched."""
+    runner = CliRunner()
+    files = [tmp_path / name for name in ("p.prompt", "code.py", "test_1.py", "test_2.py", "error.txt")]
+    for f in files:
+        f.write_text("content")
+
+    with patch('pdd.fix_main.fix_main') as mock_fix_main, \
+         patch('pdd.fix_main.fix_main_batch') as mock_fix_main_batch:
+        result = runner.invoke(cli.cli, [
+            '--local', 'fix', '--manual', '--batch',
+            '--output-test', str(tmp_path / "fixed_test.py"), *[str(f) for f in files],
+        ])
+
+    assert "--output-test must be a directory" in result.output
+    mock_fix_main.assert_not_called()
+    mock_fix_main_batch.assert_not_called()
+
+
+def test_cli_fix_batch_reports_files_skipped_for_budget(tmp_path):
+    """Test files left out of the batch results are reported as skipped, not fixed."""
+    runner = CliRunner()
+    files = ["p.prompt", "code.py", "test_1.py", "test_2.py", "error.txt"]
+    fixed, skipped = files[2], files[3]
+
+    # Relative names in a scratch cwd keep the summary lines short enough not to wrap.
+    with runner.isolated_filesystem(temp_dir=tmp_path), \
+         patch('pdd.fix_main.fix_main_batch') as mock_fix_main_batch:
+        for name in files:
+            Path(name).write_text("content")
+        mock_fix_main_batch.return_value = ({fixed: (True, fixed)}, "", 1, 0.1, "gpt-4")
+        result = runner.invoke(cli.cli, ['--local', 'fix', '--manual', '--batch', *files])
+
+    assert f"{fixed}: Fixed" in result.output
+    assert f"{skipped}: Skipped (budget exhausted)" in result.output
+    assert "Some files failed to fix." in result.output
+
+
+def test_cli_fix_multiple_test_files_run_concurrently(tmp_path, monkeypatch):
+    """Non-loop fixes of independent test files run in parallel threads."""
+    import threading
+
+    runner = CliRunner()
+    monkeypatch.setenv("PDD_FIX_CONCURRENCY", "2")
+
+    prompt_file = tmp_path / "prompt.prompt"
+    prompt_file.write_text("prompt content")
+    code_file = tmp_path / "code.py"
+    code_file.write_text("code content")
+    test_files = [tmp_path / "test_1.py", tmp_path / "test_2.py"]
+    for tf in test_files:
+        tf.write_text("test content")
+    error_file = tmp_path / "error.txt"
+    error_file.write_text("error content")
+
+    # Each call waits for the other; a serial loop would time out here.
+    barrier = threading.Barrier(2, timeout=10)
+
+    def fake_fix_main(**kwargs):
+        barrier.wait()
+        return (True, "fixed_test", "fixed_code", 1, 0.1, "gpt-4")
+
+    with patch('pdd.fix_main.fix_main', side_effect=fake_fix_main) as mock_fix_main:
+        result = runner.invoke(cli.cli, [
+            '--force', 'fix', '--manual', '--budget', '4.0',
+            str(prompt_file), str(code_file), *[str(tf) for tf in test_files], str(error_file),
+        ])
+
+    assert result.exit_code == 0, result.output
+    assert mock_fix_main.call_count == 2
+    # Files in flight split the budget instead of each getting all of it.
+    assert [c.kwargs["budget"] for c in mock_fix_main.call_args_list] == [2.0, 2.0]
+
+
+@pytest.mark.parametrize("global_args,fix_args", [
+    ([], []),
+    (['--force'], ['--output-results', 'results.log']),
+])
+def test_cli_fix_multiple_test_files_run_serially_when_shared(
+    tmp_path, monkeypatch, global_args, fix_args
+):
+    """Without --force, or with a shared output file, test files are fixed one at a time."""
+    import threading
+
+    runner = CliRunner()
+    monkeypatch.setenv("PDD_FIX_CONCURRENCY", "2")
+    monkeypatch.chdir(tmp_path)
+    files = [tmp_path / name for name in ("p.prompt", "code.py", "test_1.py", "test_2.py", "error.txt")]
+    for f in files:
+        f.write_text("content")
+
+    threads = set()
+
+    def fake_fix_main(**kwargs):
+        threads.add(threading.get_ident())
+        return (True, "fixed_test", "fixed_code", 1, 0.1, "gpt-4")
+
+    with patch('pdd.fix_main.fix_main', side_effect=fake_fix_main) as mock_fix_main:
+        result = runner.invoke(cli.cli, [
+            *global_args, 'fix', '--manual', *fix_args, *[str(f) for f in files],
+        ])
+
+    assert result.exit_code == 0, result.output
+    assert mock_fix_main.call_count == 2
+    assert threads == {threading.get_ident()}
+
+
 @pytest.mark.parametrize("num_test_files", [1, 2])
 def test_cli_fix_loop_mode_no_error_file(tmp_path, num_test_files):
     """Test --loop mode doesn't require ERROR_FILE (Issue #233)."""
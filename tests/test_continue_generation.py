@@ -66,6 +66,24 @@ def test_successful_generation(basic_inputs, mock_llm_responses):
         assert model == "gpt-4"
         assert cost > 0
 
+def test_structurally_complete_continuation_skips_unfinished_check(basic_inputs, mock_llm_responses):
+    """A normally finished, parseable continuation needs no LLM completion judge."""
+    with patch('pdd.continue_generation.load_prompt_template', return_value="Mock prompt template"), \
+         patch('pdd.continue_generation.preprocess', return_value="Processed prompt"), \
+         patch('pdd.continue_generation.llm_invoke') as mock_llm_invoke, \
+         patch('pdd.continue_generation.unfinished_prompt') as mock_unfinished:
+        mock_llm_invoke.side_effect = [
+            {'result': MagicMock(code_block='x = 1\n'), 'cost': 0.001, 'model_name': 'm'},
+            {'result': 'y = 2\n', 'cost': 0.002, 'model_name': 'gpt-4', 'finish_reason': 'stop'},
+            mock_llm_responses['trim'],
+        ]
+
+        result, cost, model = continue_generation(**basic_inputs, language="python")
+
+        mock_unfinished.assert_not_called()
+        assert result == 'x = 1\nFinal trimmed part'
+        assert model == "gpt-4"
+
 def test_missing_prompt_template(basic_inputs):
     """Test handling of missing prompt template"""
     with patch('pdd.continue_generation.load_prompt_template') as mock_load:
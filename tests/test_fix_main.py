@@ -2834,3 +2834,223 @@ def test_fix_main_auto_submit_prompt_documents_cloud_skip():
         "fix_main_python.prompt must spec the cloud short-circuit for auto-submit"
     assert "asyncio.wait_for" in prose and "PDD_AUTO_SUBMIT_AUTH_TIMEOUT_S" in prose, \
         "fix_main_python.prompt must spec the bounded asyncio JWT call"
+
+
+# --- Batched fix (fix_main_batch) ---
+
+def test_batch_file_tags_round_trip():
+    """Tests joined with <file name="..."> tags split back into the same files."""
+    from pdd.fix_main import _join_batch_tests, _split_batch_tests
+
+    tests = {
+        "tests/test_a.py": "def test_a():\n    assert 1\n",
+        "tests/test_b.py": "def test_b():\n    assert 2\n",
+    }
+    split = _split_batch_tests(_join_batch_tests(tests), list(tests))
+    assert split == tests
+
+
+@pytest.mark.parametrize("output", [
+    "def test_a():\n    assert 1\n",
+    '<file name="tests/test_a.py">\ndef test_a(): pass\n</file>',
+    '<file name="tests/test_a.py">\n</file>\n<file name="tests/test_c.py">\n</file>',
+])
+def test_batch_split_mismatch_raises(output):
+    """Output that does not map one-to-one onto the batch is rejected."""
+    from pdd.fix_main import _split_batch_tests
+
+    with pytest.raises(ValueError, match="could not be split"):
+        _split_batch_tests(output, ["tests/test_a.py", "tests/test_b.py"])
+
+
+@patch('pdd.fix_main.run_pytest_on_file', return_value=(0, 0, 0, "ok"))
+@patch('pdd.fix_main.construct_paths')
+@patch('pdd.fix_main.fix_errors_from_unit_tests')
+def test_fix_main_batch_single_llm_call(
+    mock_fix_errors, mock_construct_paths, mock_run_pytest, mock_ctx, tmp_path
+):
+    """All test files for one prompt/code pair are fixed with a single LLM call."""
+    from pdd.fix_main import fix_main_batch, _join_batch_tests
+
+    error_file = tmp_path / "errors.log"
+    error_file.write_text("boom")
+    test_files = [str(tmp_path / "test_a.py"), str(tmp_path / "test_b.py")]
+
+    def construct_side_effect(input_file_paths, **kwargs):
+        unit_test_file = input_file_paths["unit_test_file"]
+        stem = Path(unit_test_file).stem
+        return (
+            {},
+            {
+                "prompt_file": "prompt",
+                "code_file": "code",
+                "unit_test_file": f"# original {stem}\n",
+                "error_file": "boom",
+            },
+            {
+                "output_test": str(tmp_path / f"{stem}_fixed.py"),
+                "output_code": str(tmp_path / "code_fixed.py"),
+                "output_results": str(tmp_path / "results.log"),
+            },
+            "python",
+        )
+
+    mock_construct_paths.side_effect = construct_side_effect
+    fixed_tests = {path: f"def test_{Path(path).stem}():\n    pass\n" for path in test_files}
+    mock_fix_errors.return_value = (
+        True, False, _join_batch_tests(fixed_tests), "", "analysis", 0.3, "gpt-4"
+    )
+
+    results, fixed_code, attempts, cost, model = fix_main_batch(
+        ctx=mock_ctx,
+        prompt_file="prompt.prompt",
+        code_file="code.py",
+        unit_test_files=test_files,
+        error_file=str(error_file),
+        output_test=None,
+        output_code=None,
+        output_results=None,
+        budget=5.0,
+    )
+
+    assert mock_fix_errors.call_count == 1
+    sent_tests = mock_fix_errors.call_args.kwargs["unit_test"]
+    assert all(f'<file name="{path}">' in sent_tests for path in test_files)
+    assert attempts == 1
+    assert cost == 0.3
+    assert model == "gpt-4"
+    assert fixed_code == ""
+    for path in test_files:
+        success, output_path = results[path]
+        assert success is True
+        assert Path(output_path).read_text() == fixed_tests[path]
+
+
+@patch('pdd.fix_main.run_pytest_on_file', return_value=(0, 0, 0, "ok"))
+@patch('pdd.fix_main.construct_paths')
+@patch('pdd.fix_main.fix_errors_from_unit_tests')
+def test_fix_main_batch_caps_batch_size_and_budget(
+    mock_fix_errors, mock_construct_paths, mock_run_pytest, mock_ctx, tmp_path
+):
+    """Test files are split into BATCH_MAX-sized requests and stop once over budget."""
+    from pdd.fix_main import fix_main_batch, BATCH_MAX
+
+    error_file = tmp_path / "errors.log"
+    error_file.write_text("boom")
+    test_files = [str(tmp_path / f"test_{i}.py") for i in range(BATCH_MAX * 2 + 1)]
+    mock_construct_paths.return_value = (
+        {},
+        {"prompt_file": "p", "code_file": "c", "unit_test_file": "t", "error_file": "boom"},
+        {
+            "output_test": str(tmp_path / "out_test.py"),
+            "output_code": str(tmp_path / "code_fixed.py"),
+            "output_results": str(tmp_path / "results.log"),
+        },
+        "python",
+    )
+    mock_fix_errors.return_value = (False, True, "", "fixed code", "analysis", 1.0, "gpt-4")
+
+    results, fixed_code, attempts, cost, _ = fix_main_batch(
+        ctx=mock_ctx,
+        prompt_file="prompt.prompt",
+        code_file="code.py",
+        unit_test_files=test_files,
+        error_file=str(error_file),
+        output_test=None,
+        output_code=None,
+        output_results=None,
+        budget=1.5,
+    )
+
+    assert attempts == 2
+    assert cost == 2.0
+    assert fixed_code == "fixed code"
+    assert (tmp_path / "code_fixed.py").read_text() == "fixed code"
+    # The last batch never reached the LLM, so its file is left out, not reported fixed.
+    assert set(results) == set(test_files[:BATCH_MAX * 2])
+    assert test_files[-1] not in results
+
+
+@patch('pdd.fix_main.construct_paths')
+@patch('pdd.fix_main.fix_errors_from_unit_tests')
+def test_fix_main_batch_rejects_per_file_code_output(
+    mock_fix_errors, mock_construct_paths, mock_ctx, tmp_path
+):
+    """Test files that resolve to different fixed-code paths cannot share a batch."""
+    from pdd.fix_main import fix_main_batch
+
+    error_file = tmp_path / "errors.log"
+    error_file.write_text("boom")
+    test_files = [str(tmp_path / "test_a.py"), str(tmp_path / "test_b.py")]
+
+    def construct_side_effect(input_file_paths, **kwargs):
+        stem = Path(input_file_paths["unit_test_file"]).stem
+        return (
+            {},
+            {"prompt_file": "p", "code_file": "c", "unit_test_file": "t", "error_file": "boom"},
+            {
+                "output_test": str(tmp_path / f"{stem}_fixed.py"),
+                "output_code": str(tmp_path / f"code_{stem}.py"),
+                "output_results": str(tmp_path / "results.log"),
+            },
+            "python",
+        )
+
+    mock_construct_paths.side_effect = construct_side_effect
+
+    with pytest.raises(UsageError, match="--output-code"):
+        fix_main_batch(
+            ctx=mock_ctx,
+            prompt_file="prompt.prompt",
+            code_file="code.py",
+            unit_test_files=test_files,
+            error_file=str(error_file),
+            output_test=None,
+            output_code=None,
+            output_results=None,
+            budget=5.0,
+        )
+
+    mock_fix_errors.assert_not_called()
+
+
+@patch('pdd.fix_main.construct_paths')
+@patch('pdd.fix_main.fix_errors_from_unit_tests')
+def test_fix_main_batch_split_failure_writes_nothing(
+    mock_fix_errors, mock_construct_paths, mock_ctx, tmp_path
+):
+    """When the fixed tests cannot be split per file, no test or code output is written."""
+    from pdd.fix_main import fix_main_batch
+
+    error_file = tmp_path / "errors.log"
+    error_file.write_text("boom")
+    test_files = [str(tmp_path / "test_a.py"), str(tmp_path / "test_b.py")]
+    mock_construct_paths.return_value = (
+        {},
+        {"prompt_file": "p", "code_file": "c", "unit_test_file": "t", "error_file": "boom"},
+        {
+            "output_test": str(tmp_path / "out_test.py"),
+            "output_code": str(tmp_path / "code_fixed.py"),
+            "output_results": str(tmp_path / "results.log"),
+        },
+        "python",
+    )
+    mock_fix_errors.return_value = (
+        True, True, "def test_merged():\n    pass\n", "fixed code", "analysis", 0.3, "gpt-4"
+    )
+
+    with pytest.raises(ValueError, match="could not be split"):
+        fix_main_batch(
+            ctx=mock_ctx,
+            prompt_file="prompt.prompt",
+            code_file="code.py",
+            unit_test_files=test_files,
+            error_file=str(error_file),
+            output_test=None,
+            output_code=None,
+            output_results=None,
+            budget=5.0,
+        )
+
+    assert not (tmp_path / "code_fixed.py").exists()
+    assert not (tmp_path / "out_test.py").exists()
@@ -2,11 +2,21 @@
 
 from pathlib import Path
 
+import asyncio
+import sys
+
 import pytest
 from unittest.mock import patch
 from rich.console import Console
-from pdd import DEFAULT_STRENGTH
-from pdd.generate_test import generate_test, _validate_inputs
+from pdd import DEFAULT_STRENGTH, VERIFICATION_STRENGTH, VERIFICATION_TIME
+from pdd.generate_test import (
+    _ends_with_closed_fence,
+    _load_preprocessed_template,
+    _single_code_block,
+    _validate_settings,
+    agenerate_test,
+    generate_test,
+)
 
 
 def get_project_root() -> Path:
@@ -53,6 +63,14 @@ def test_example():
 '''
 
 
+@pytest.fixture(autouse=True)
+def _clear_template_cache():
+    """Tests patch load_prompt_template, so never reuse a cached template."""
+    _load_preprocessed_template.cache_clear()
+    yield
+    _load_preprocessed_template.cache_clear()
+
+
 @pytest.fixture(autouse=True)
 def _mock_generate_test_llm(monkeypatch, request):
     """Avoid real LLM calls in tests that exercise generate_test end-to-end."""
@@ -116,29 +134,47 @@ def test_generate_test_verbose(valid_inputs):
     assert len(result) == 3
 
 # Test input validation
-def test_validate_inputs_empty_prompt():
-    with pytest.raises(ValueError, match="Prompt must be a non-empty string"):
-        _validate_inputs("", "code", DEFAULT_STRENGTH, 0.5, "python")
+def test_validate_settings_invalid_strength():
+    with pytest.raises(ValueError, match="Strength must be a float between 0 and 1"):
+        _validate_settings(1.5, 0.5, "python")
+
+
+def test_validate_settings_invalid_temperature():
+    with pytest.raises(ValueError, match="Temperature must be a float"):
+        _validate_settings(DEFAULT_STRENGTH, "invalid", "python")
+
+
+def test_validate_settings_empty_language():
+    with pytest.raises(ValueError, match="Language must be a non-empty string"):
+        _validate_settings(DEFAULT_STRENGTH, 0.5, "")
 
 
-def test_validate_inputs_none_code():
-    with pytest.raises(ValueError, match="Code must be a non-empty string"):
-        _validate_inputs("prompt", None, DEFAULT_STRENGTH, 0.5, "python")
+def test_generate_test_requires_code_or_example(valid_inputs):
+    valid_inputs['code'] = None
+    with pytest.raises(ValueError, match="Exactly one of 'code' or 'example' must be provided"):
+        generate_test(**valid_inputs)
 
 
-def test_validate_inputs_invalid_strength():
+def test_generate_test_validates_inputs(valid_inputs):
+    valid_inputs['strength'] = 1.5
     with pytest.raises(ValueError, match="Strength must be a float between 0 and 1"):
-        _validate_inputs("prompt", "code", 1.5, 0.5, "python")
+        generate_test(**valid_inputs)
 
 
-def test_validate_inputs_invalid_temperature():
-    with pytest.raises(ValueError, match="Temperature must be a float"):
-        _validate_inputs("prompt", "code", DEFAULT_STRENGTH, "invalid", "python")
+def test_generate_test_accepts_empty_code_stub(valid_inputs, monkeypatch):
+    """An empty code stub is passed through to the LLM rather than rejected."""
+    sent = []
 
+    def fake_llm_invoke(**kwargs):
+        sent.append(kwargs["input_json"])
+        return {"result": "```python\ndef test_stub():\n    pass\n```\n",
+                "cost": 0.0, "model_name": "m"}
 
-def test_validate_inputs_empty_language():
-    with pytest.raises(ValueError, match="Language must be a non-empty string"):
-        _validate_inputs("prompt", "code", DEFAULT_STRENGTH, 0.5, "")
+    monkeypatch.setattr("pdd.generate_test.llm_invoke", fake_llm_invoke)
+    valid_inputs['code'] = "   "
+    unit_test, _, _ = generate_test(**valid_inputs)
+    assert sent and sent[0]["code"] == "   "
+    assert "def test_stub" in unit_test
 
 # Test error handling
 def test_generate_test_invalid_template(valid_inputs, monkeypatch):
@@ -280,6 +316,285 @@ def test_generate_test_uses_example_template(mock_postprocess, mock_llm_invoke,
     mock_load_template.assert_called_once_with("generate_test_from_example_LLM")
 
 
+def test_generate_test_regex_fallback_prefers_test_block(monkeypatch):
+    """When postprocess fails, the fenced block that looks like a test wins."""
+    text = (
+        "```python\nhelper = 1\nhelper_two = 2\n```\n"
+        "```python\ndef test_add():\n    assert 1 + 1 == 2\n```\n"
+    )
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": text, "cost": 0.0, "model_name": "test-model"},
+    )
+
+    def failing_postprocess(**kwargs):
+        raise RuntimeError("extraction failed")
+
+    monkeypatch.setattr("pdd.generate_test.postprocess", failing_postprocess)
+    unit_test, _, _ = generate_test(prompt="p", code="c", language="javascript")
+    assert unit_test == "def test_add():\n    assert 1 + 1 == 2\n"
+
+
+def test_generate_test_falls_back_when_postprocess_keeps_fences(monkeypatch):
+    """A postprocess result that still carries fences falls back to regex extraction."""
+    text = "```python\nhelper = 1\n```\n```python\ndef test_b():\n    pass\n```\n"
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": text, "cost": 0.0, "model_name": "m"},
+    )
+    monkeypatch.setattr(
+        "pdd.generate_test.postprocess",
+        lambda **kwargs: (kwargs["llm_output"], 0.0, "m"),
+    )
+    unit_test, _, _ = generate_test(prompt="p", code="c", language="javascript")
+    assert unit_test == "def test_b():\n    pass\n"
+
+
+def test_generate_test_unfinished_check_ignores_trailing_whitespace(monkeypatch):
+    """The completion check sees the last 600 characters of real content."""
+    text = "x" * 5000 + "END" + " \n" * 300
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": text, "cost": 0.0, "model_name": "test-model"},
+    )
+    seen = {}
+
+    def fake_unfinished(**kwargs):
+        seen["prompt_text"] = kwargs["prompt_text"]
+        return ("", True, 0.0, "test-model")
+
+    monkeypatch.setattr("pdd.generate_test.unfinished_prompt", fake_unfinished)
+    generate_test(prompt="p", code="c")
+    assert seen["prompt_text"] == ("x" * 5000 + "END")[-600:]
+
+
+def test_generate_test_discards_speculative_extraction_after_continuation(monkeypatch):
+    """Postprocess runs alongside the check but is redone on continued output."""
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": "def test_a(", "cost": 0.1, "model_name": "m"},
+    )
+    monkeypatch.setattr(
+        "pdd.generate_test.unfinished_prompt",
+        lambda **kwargs: ("cut off", False, 0.0, "m"),
+    )
+    monkeypatch.setattr(
+        "pdd.generate_test.continue_generation",
+        lambda **kwargs: ("def test_a():\n    pass", 0.0, "cont-model"),
+    )
+    extracted_from = []
+
+    def fake_postprocess(**kwargs):
+        extracted_from.append(kwargs["llm_output"])
+        return (kwargs["llm_output"], 0.01, "m")
+
+    monkeypatch.setattr("pdd.generate_test.postprocess", fake_postprocess)
+    unit_test, total_cost, model_name = generate_test(prompt="p", code="c", language="javascript")
+    assert sorted(extracted_from) == ["def test_a(", "def test_a():\n    pass"]
+    assert unit_test == "def test_a():\n    pass"
+    assert total_cost == pytest.approx(0.12)
+    assert model_name == "cont-model"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("```python\nimport os\n```", "import os"),
+    ("intro\n```\ndef test_a():\n    pass\n```\noutro", "def test_a():\n    pass"),
+    ("```text\njust some words\n```", None),
+    ("```python\nimport os\n```\n```python\nimport sys\n```", None),
+    ("no fences", None),
+])
+def test_single_code_block(text, expected):
+    assert _single_code_block(text) == expected
+
+
+def test_generate_test_single_fenced_block_skips_postprocess(monkeypatch):
+    """One clean fenced code block is extracted without the LLM postprocess call."""
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": "Here you go:\n```js\nconst add = require('./add');\n```\n",
+                          "cost": 0.0, "model_name": "m"},
+    )
+    calls = []
+    monkeypatch.setattr(
+        "pdd.generate_test.postprocess",
+        lambda **kwargs: calls.append(kwargs) or ("", 0.0, "m"),
+    )
+    unit_test, total_cost, _ = generate_test(prompt="p", code="c", language="javascript")
+    assert calls == []
+    assert unit_test == "const add = require('./add');"
+    assert total_cost == 0.0
+
+
+def test_generate_test_verbose_prints_large_output_raw(monkeypatch):
+    """Huge verbose output is not parsed as Markdown."""
+    big = "```python\n" + "def test_a():\n    pass\n" * 5000 + "```\n"
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": big, "cost": 0.0, "model_name": "m"},
+    )
+    monkeypatch.setattr(
+        "pdd.generate_test.Markdown",
+        lambda text: pytest.fail("Markdown should not render large output"),
+    )
+    monkeypatch.setattr("pdd.generate_test.console.print", lambda *args, **kwargs: None)
+    unit_test, _, _ = generate_test(prompt="p", code="c", verbose=True)
+    assert "def test_a" in unit_test
+
+
+def test_generate_test_result_cache(monkeypatch, tmp_path):
+    """With the cache enabled, repeated temperature-0 requests skip the LLM."""
+    monkeypatch.setenv("PDD_GENERATE_TEST_CACHE", "1")
+    monkeypatch.setenv("PDD_GENERATE_TEST_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def fake_llm_invoke(**kwargs):
+        calls.append(kwargs)
+        return {"result": "```js\nconst a = require('a');\n```", "cost": 0.5, "model_name": "m"}
+
+    monkeypatch.setattr("pdd.generate_test.llm_invoke", fake_llm_invoke)
+    kwargs = dict(prompt="p", code="c", language="javascript", temperature=0.0)
+    first = generate_test(**kwargs)
+    second = generate_test(**kwargs)
+    assert len(calls) == 1
+    assert second == (first[0], 0.0, first[2])
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    generate_test(**{**kwargs, "code": "other"})
+    generate_test(**{**kwargs, "temperature": 0.5})
+    assert len(calls) == 3
+
+
+def test_generate_test_result_cache_keys_on_model_config(monkeypatch, tmp_path):
+    """Changing the default model or the model CSV misses the result cache."""
+    llm_module = sys.modules["pdd.llm_invoke"]
+    monkeypatch.setenv("PDD_GENERATE_TEST_CACHE", "1")
+    monkeypatch.setenv("PDD_GENERATE_TEST_CACHE_DIR", str(tmp_path / "cache"))
+    csv_path = tmp_path / "llm_model.csv"
+    csv_path.write_text("provider,model\nA,model-a\n")
+    monkeypatch.setattr(llm_module, "LLM_MODEL_CSV_PATH", csv_path)
+    monkeypatch.setattr(llm_module, "DEFAULT_BASE_MODEL", "model-a")
+    calls = []
+
+    def fake_llm_invoke(**kwargs):
+        calls.append(kwargs)
+        return {"result": "```js\nconst a = require('a');\n```", "cost": 0.5, "model_name": "m"}
+
+    monkeypatch.setattr("pdd.generate_test.llm_invoke", fake_llm_invoke)
+    kwargs = dict(prompt="p", code="c", language="javascript", temperature=0.0)
+    generate_test(**kwargs)
+    generate_test(**kwargs)
+    assert len(calls) == 1
+
+    monkeypatch.setattr(llm_module, "DEFAULT_BASE_MODEL", "model-b")
+    generate_test(**kwargs)
+    assert len(calls) == 2
+
+    csv_path.write_text("provider,model\nB,model-b\n")
+    generate_test(**kwargs)
+    assert len(calls) == 3
+
+
+def test_generate_test_continues_with_rendered_prompt(monkeypatch):
+    """The prompt rendered by llm_invoke is reused for continue_generation."""
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": "def test_a(", "cost": 0.0, "model_name": "m",
+                          "rendered_prompt": "RENDERED PROMPT"},
+    )
+    monkeypatch.setattr(
+        "pdd.generate_test.unfinished_prompt",
+        lambda **kwargs: ("cut off", False, 0.0, "m"),
+    )
+    seen = {}
+
+    def fake_continue(**kwargs):
+        seen.update(kwargs)
+        return ("def test_a():\n    pass", 0.0, "m")
+
+    monkeypatch.setattr("pdd.generate_test.continue_generation", fake_continue)
+    generate_test(prompt="p", code="c")
+    assert seen["formatted_input_prompt"] == "RENDERED PROMPT"
+
+
+def test_generate_test_uses_cheap_tier_for_auxiliary_calls(monkeypatch):
+    """The completion check and extraction do not use the caller's strength/time."""
+    monkeypatch.setattr(
+        "pdd.generate_test.llm_invoke",
+        lambda **kwargs: {"result": "def test_a():\n    pass", "cost": 0.0, "model_name": "m"},
+    )
+    seen = {}
+
+    def fake_unfinished(**kwargs):
+        seen["unfinished"] = kwargs
+        return ("", True, 0.0, "m")
+
+    def fake_postprocess(**kwargs):
+        seen["postprocess"] = kwargs
+        return ("def test_a():\n    pass", 0.0, "m")
+
+    monkeypatch.setattr("pdd.generate_test.unfinished_prompt", fake_unfinished)
+    monkeypatch.setattr("pdd.generate_test.postprocess", fake_postprocess)
+    generate_test(prompt="p", code="c", strength=1.0, time=1.0)
+    assert seen["unfinished"]["strength"] == VERIFICATION_STRENGTH
+    assert seen["unfinished"]["time"] == VERIFICATION_TIME
+    assert seen["postprocess"]["time"] == 0.0
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("intro\n```python\ndef test_a():\n    pass\n```\n", True),
+    ("```python\ndef test_a():\n    pass\n```\nmore text", False),
+    ("```python\ndef test_a():\n    pass\n", False),
+    ("```python\na = 1\n```\n```python\ndef test_a(", False),
+    ("no fences at all", False),
+])
+def test_ends_with_closed_fence(text, expected):
+    assert _ends_with_closed_fence(text) is expected
+
+
+def test_generate_test_skips_unfinished_check_for_closed_fence(monkeypatch):
+    """A cleanly closed code block does not cost an unfinished_prompt call."""
+    calls = []
+    monkeypatch.setattr(
+        "pdd.generate_test.unfinished_prompt",
+        lambda **kwargs: calls.append(kwargs) or ("", True, 0.0, "test-model"),
+    )
+    unit_test, _, _ = generate_test(prompt="p", code="c")
+    assert calls == []
+    assert "def test_example" in unit_test
+
+
+@patch("pdd.generate_test.load_prompt_template", return_value="template content")
+def test_generate_test_loads_template_once(mock_load_template, valid_inputs):
+    """The preprocessed template is cached across generate_test calls."""
+    generate_test(**valid_inputs)
+    generate_test(**valid_inputs)
+    mock_load_template.assert_called_once_with("generate_test_LLM")
+
+
+@pytest.mark.asyncio
+async def test_agenerate_test_matches_sync_result(valid_inputs):
+    """agenerate_test returns the same tuple as generate_test and can be gathered."""
+    expected = generate_test(**valid_inputs)
+    results = await asyncio.gather(
+        agenerate_test(**valid_inputs),
+        agenerate_test(**valid_inputs),
+    )
+    assert results == [expected, expected]
+
+
+@pytest.mark.parametrize("template_name", [
+    "generate_test_LLM",
+    "generate_test_from_example_LLM",
+])
+def test_template_places_per_call_inputs_after_instructions(template_name):
+    """Static instructions form a stable prefix so providers can cache it."""
+    content = read_prompt_file(f"pdd/prompts/{template_name}.prompt")
+    instructions_end = content.index("</instructions>")
+    for field in ("{prompt_that_generated_code}", "{source_file_path}",
+                  "{test_file_path}", "{module_name}", "{existing_tests}"):
+        assert content.index(field) > instructions_end, field
+
+
 @pytest.mark.usefixtures()
 class TestSysPathIsolation:
     """Tests for Issue #342: Verify generated tests include sys.path isolation preamble.
@@ -500,6 +500,7 @@ def test_llm_invoke_valid_input(mock_load_models, mock_set_llm_cache):
                  assert response['model_name'] == 'gpt-5-nano'
                  assert response['result'] == mock_response_content
                  assert response['cost'] == mock_cost
+                 assert response['rendered_prompt'] == "Valid prompt about cats"
                  mock_completion.assert_called_once()
                  call_args, call_kwargs = mock_completion.call_args
                  assert call_kwargs['model'] == 'gpt-5-nano'
@@ -6485,6 +6486,54 @@ class TestGroqMessageMutation(_GroqMutationFixture):
         assert fallback_sys["content"] == original, \
             f"System message mutated: {fallback_sys['content'][:200]}"
 
+    def test_groq_attempt_leaves_caller_messages_unchanged(self):
+        """The caller's message list and dicts are never modified."""
+        messages = [{"role": "system", "content": "You are a helpful math tutor."},
+                    {"role": "user", "content": "What is 2+2?"}]
+        snapshot = copy.deepcopy(messages)
+        self._run(
+            messages,
+            [("Groq", "groq/llama-3.3-70b-versatile", 1200, "GROQ_API_KEY"),
+             ("OpenAI", "gpt-4o-mini", 1100, "OPENAI_API_KEY")],
+        )
+        assert messages == snapshot
+
+    def test_batch_mode_passes_one_message_list_per_conversation(self):
+        """Batch mode copies each conversation's messages, not the conversations."""
+        import pdd.llm_invoke as _llm_mod
+
+        models = [self._model("OpenAI", "gpt-4o-mini", 1100, "OPENAI_API_KEY")]
+        conversations = [
+            [{"role": "user", "content": "What is 2+2?"}],
+            [{"role": "system", "content": "Be brief."},
+             {"role": "user", "content": "What is 3+3?"}],
+        ]
+        snapshot = copy.deepcopy(conversations)
+        captured = []
+
+        def batch_side_effect(**kwargs):
+            captured.append(copy.deepcopy(kwargs))
+            _llm_mod._LAST_CALLBACK_DATA["cost"] = 0.001
+            return [self._make_response("4"), self._make_response("6")]
+
+        with patch.dict(os.environ, {"PDD_FORCE_LOCAL": "1", "OPENAI_API_KEY": "k"}), \
+             patch("pdd.llm_invoke._ensure_api_key", return_value=True), \
+             patch("pdd.llm_invoke._select_model_candidates", return_value=models), \
+             patch("pdd.llm_invoke._load_model_data", return_value=pd.DataFrame(models)), \
+             patch("pdd.llm_invoke.litellm") as mock_litellm:
+            mock_litellm.batch_completion = MagicMock(side_effect=batch_side_effect)
+            mock_litellm.cache = None
+            mock_litellm.drop_params = True
+            mock_litellm.ContextWindowExceededError = litellm.ContextWindowExceededError
+            llm_invoke(
+                messages=conversations, strength=0.5, temperature=0.0,
+                time=0.0, use_batch_mode=True, use_cloud=False,
+            )
+
+        assert len(captured) == 1
+        assert captured[0]["messages"] == snapshot
+        assert conversations == snapshot
+
     def test_groq_multiple_failures_no_cumulative_corruption(self):
         """Two Groq models fail; schema instructions must not accumulate."""
         captured = self._run(